@@ -19,3 +19,44 @@ class Configs:
     SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key_placeholder")
     CORS_ORIGINS = ["http://localhost:63343"]
     ENV = os.getenv("ENV", "development")
+    CAFE_CACHE_MAXSIZE = int(os.getenv("CAFE_CACHE_MAXSIZE", "1024"))
+    CAFE_CACHE_TTL = float(os.getenv("CAFE_CACHE_TTL", "60"))
+    CAFE_BULK_MAX_ITEMS = int(os.getenv("CAFE_BULK_MAX_ITEMS", "5000"))
+    CATEGORY_REGISTRY_MAX_AGE = float(os.getenv("CATEGORY_REGISTRY_MAX_AGE", "300"))
+    # 'bayesian' (mean rating shrunk towards the catalog mean) or 'wilson' (lower confidence bound)
+    RANKING_METHOD = os.getenv("RANKING_METHOD", "bayesian")
+    RANKING_PRIOR_WEIGHT = float(os.getenv("RANKING_PRIOR_WEIGHT", "10"))
+    # Seconds between background ranking_score recomputes; 0 disables them
+    RANKING_REFRESH_INTERVAL = float(os.getenv("RANKING_REFRESH_INTERVAL", "300"))
+    # A recomputed ranking_score is only written when it moved by more than this; smaller moves (e.g.
+    # every cafe's share of one review shifting the Bayesian prior) do not change the order in practice
+    RANKING_SCORE_TOLERANCE = float(os.getenv("RANKING_SCORE_TOLERANCE", "0.001"))
+    SIMILAR_CAFES_K = int(os.getenv("SIMILAR_CAFES_K", "10"))
+    # Written by the one worker that rebuilds the index and read by the others: keep it on a shared path
+    SIMILAR_INDEX_PATH = os.getenv("SIMILAR_INDEX_PATH", "similar_cafes.npz")
+    # Seconds between checks for catalog writes that call for a similar-cafes rebuild; 0 disables them
+    SIMILAR_REFRESH_INTERVAL = float(os.getenv("SIMILAR_REFRESH_INTERVAL", "60"))
+    NEARBY_MAX_RADIUS_M = float(os.getenv("NEARBY_MAX_RADIUS_M", "50000"))
+    # Seconds between reloads of the shared table versions: how long another worker's write can go
+    # unnoticed by this worker's ETags and response cache; 0 disables the reloads (single process only)
+    TABLE_VERSION_REFRESH_INTERVAL = float(os.getenv("TABLE_VERSION_REFRESH_INTERVAL", "1"))
+    CITY_INDEX_MAX_AGE = float(os.getenv("CITY_INDEX_MAX_AGE", "300"))
+    # Database engine profile: defaults depend on ENV. SQL echo is for local development only
+    DB_ECHO = os.getenv("DB_ECHO", str(ENV == "development")).lower() in ("1", "true", "yes")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20" if ENV == "production" else "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10" if ENV == "production" else "5"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10" if ENV == "production" else "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Per-connection asyncpg prepared statement LRU; 0 is required behind a transaction-mode PgBouncer
+    DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "500"))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024)))
+    # Share of 2xx responses written to the access log (1.0: all, 0.0: none); other statuses are always logged
+    ACCESS_LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SUCCESS_SAMPLE_RATE", "1.0"))
+    # Relationships not loaded by a query's own options raise instead of lazy loading row by row
+    ORM_STRICT_LOADING = os.getenv("ORM_STRICT_LOADING", str(ENV == "test")).lower() in ("1", "true", "yes")
+    # Per-request SQL statement count and time in a Server-Timing response header
+    SQL_SERVER_TIMING = os.getenv("SQL_SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+    # A statement repeated more than this many times in one request is logged as a likely N+1; 0 disables
+    SQL_REPEAT_WARNING_THRESHOLD = int(os.getenv("SQL_REPEAT_WARNING_THRESHOLD", "10"))
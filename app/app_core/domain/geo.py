@@ -0,0 +1,81 @@
+import math
+from typing import List
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+# Geohash precision stored per cafe: ~4.8 m x 4.8 m cells at the equator
+GEOHASH_PRECISION = 9
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def _cell_size(precision: int) -> tuple[float, float]:
+    """(height, width) of a geohash cell of ``precision`` characters, in degrees."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def covering_cells(latitude: float, longitude: float, radius_m: float) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover the circle's bounding box. The precision is the finest
+    one whose cells are still at least as large as the radius, so at most 3 x 3 cells come back.
+    """
+    lat_delta = radius_m / _METERS_PER_DEGREE
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_delta, 90.0)))
+    lon_delta = 360.0 if cos_lat < 1e-9 else min(radius_m / (_METERS_PER_DEGREE * cos_lat), 360.0)
+    precision = 0
+    while precision < GEOHASH_PRECISION:
+        height, width = _cell_size(precision + 1)
+        if height < lat_delta or width < lon_delta:
+            break
+        precision += 1
+    if precision == 0:
+        # The circle covers a sizeable part of the globe: no pruning
+        return ['']
+    height, width = _cell_size(precision)
+    south, north = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    west, east = longitude - lon_delta, longitude + lon_delta
+    cells = set()
+    lat = south
+    while True:
+        lon = west
+        while True:
+            # Wrap across the antimeridian and keep the poles inside the encodable range
+            wrapped = (lon + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(min(lat, 90.0 - 1e-9), wrapped, precision))
+            if lon >= east:
+                break
+            lon = min(lon + width, east)
+        if lat >= north:
+            break
+        lat = min(lat + height, north)
+    return sorted(cells)
+
+
+def haversine_m(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distance in meters from one point to each of the given points."""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
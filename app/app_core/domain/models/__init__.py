@@ -3,11 +3,16 @@ from app.app_core.domain.models.cafe_model import CafeModel
 from app.app_core.domain.models.category_model import CategoryModel
 from app.app_core.domain.models.cafe_category_model import CafeCategoryModel
 from app.app_core.domain.models.review_model import ReviewModel
+from app.app_core.domain.models.table_version_model import TableVersionModel
+from app.app_core.domain.models.job_lease_model import JobLeaseModel
+from app.app_core.domain.models import cafe_search_index  # noqa: F401  (registers the FTS5 DDL hooks)
 
 __all__ = [
     "UserModel",
     "CafeModel",
     "CategoryModel",
     "CafeCategoryModel",
-    "ReviewModel"
+    "ReviewModel",
+    "TableVersionModel",
+    "JobLeaseModel"
 ]
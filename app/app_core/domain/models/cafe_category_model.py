@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from app.infrastructure.database import Base
+from app.infrastructure.database import Base, RELATIONSHIP_LAZY
 from sqlalchemy import Index, UniqueConstraint, ForeignKey, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +23,6 @@ class CafeCategoryModel(Base):
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
     is_best: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
-    cafe: Mapped[CafeModel] = relationship(back_populates="category_associations")
-    category: Mapped[CategoryModel] = relationship(back_populates="cafe_associations")
+    cafe: Mapped[CafeModel] = relationship(back_populates="category_associations", lazy=RELATIONSHIP_LAZY)
+    category: Mapped[CategoryModel] = relationship(back_populates="cafe_associations", lazy=RELATIONSHIP_LAZY)
 
@@ -1,8 +1,10 @@
 from __future__ import annotations
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Text, ForeignKey, UniqueConstraint, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.infrastructure.database import Base
+from sqlalchemy import Float, Integer, String, Text, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from app.infrastructure.database import Base, RELATIONSHIP_LAZY
+from app.app_core.domain.normalization import normalize_text
+from app.app_core.domain.geo import GEOHASH_PRECISION, encode_geohash
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
 if TYPE_CHECKING:
@@ -11,26 +13,86 @@ if TYPE_CHECKING:
     from app.app_core.domain.models.review_model import ReviewModel
 
 
+CITY_MAX_LENGTH = 100
+
+
+def binary_string(length: int) -> String:
+    # Prefix filters on these columns are range scans (key <= column < key + U+10FFFF), which match
+    # exactly the prefixed values only under code point order. PostgreSQL would otherwise compare
+    # with the database's linguistic collation; SQLite's default BINARY collation already fits
+    return String(length).with_variant(String(length, collation='C'), 'postgresql')
+
+
+def normalize_city(city: str | None) -> str:
+    return normalize_text(city)[:CITY_MAX_LENGTH]
+
+
+def _city_normalized_default(context) -> str:
+    # Covers Core inserts, which bypass the @validates hook below
+    return normalize_city(context.get_current_parameters().get('city'))
+
+
+def cafe_geohash(latitude: float | None, longitude: float | None) -> str | None:
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(latitude, longitude)
+
+
+def _geohash_default(context) -> str | None:
+    # Covers Core inserts, which bypass the @validates hook below
+    parameters = context.get_current_parameters()
+    return cafe_geohash(parameters.get('latitude'), parameters.get('longitude'))
+
+
 class CafeModel(Base):
     __tablename__ = 'cafes'
     __table_args__ = (
         UniqueConstraint("title", "city", name="uq_cafe_title_city"),
         Index('idx_cafe_city', 'city'),
+        Index('idx_cafe_city_normalized', 'city_normalized'),
+        # Keyset pages of GET /cafes?sort=ranking walk (ranking_score, id) backwards
+        Index('idx_cafe_ranking_score', 'ranking_score', 'id'),
+        Index('idx_cafe_geohash', 'geohash'),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
-    city: Mapped[str] = mapped_column(String(100), nullable=False)
+    city: Mapped[str] = mapped_column(String(CITY_MAX_LENGTH), nullable=False)
+    # normalize_city(city): the indexed key used by the city filter
+    city_normalized: Mapped[str] = mapped_column(
+        binary_string(CITY_MAX_LENGTH), nullable=False, default=_city_normalized_default, server_default='')
     description: Mapped[str] = mapped_column(Text, nullable=False)
     image_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # Denormalized review aggregates, maintained by the ReviewModel mapper events
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # cafe_geohash(latitude, longitude): nearby search prunes candidates by prefixes of this
+    geohash: Mapped[str | None] = mapped_column(binary_string(GEOHASH_PRECISION), nullable=True, default=_geohash_default)
+    # Written in batch by ranking_service.recompute_rankings from the two columns above
+    ranking_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default='0')
 
     category_associations: Mapped[List[CafeCategoryModel]] = relationship(
-        back_populates="cafe", cascade="all, delete-orphan"
+        back_populates="cafe", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
     )
     reviews: Mapped[List[ReviewModel]] = relationship(
-        back_populates="cafe", cascade="all, delete-orphan"
+        back_populates="cafe", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
     )
 
+    @validates('city')
+    def _sync_city_normalized(self, _key: str, city: str) -> str:
+        self.city_normalized = normalize_city(city)
+        return city
+
+    @validates('latitude', 'longitude')
+    def _sync_geohash(self, key: str, value: float | None) -> float | None:
+        latitude, longitude = (value, self.longitude) if key == 'latitude' else (self.latitude, value)
+        self.geohash = cafe_geohash(latitude, longitude)
+        return value
+
+    # best_for / also_good_for need category_associations -> category loaded by the query itself
+    # (selectinload); under Configs.ORM_STRICT_LOADING they raise instead of lazy loading
     @property
     def best_for(self) -> Optional[CategoryModel]:
         for assoc in self.category_associations:
@@ -44,7 +106,6 @@ class CafeModel(Base):
 
     @property
     def average_rating(self) -> float:
-        if not self.reviews:
+        if not self.rating_count:
             return 0.0
-        total_rating = sum(review.rating for review in self.reviews)
-        return total_rating / len(self.reviews)
+        return self.rating_sum / self.rating_count
@@ -0,0 +1,59 @@
+from typing import List
+from sqlalchemy import DDL, event
+from app.app_core.domain.models.cafe_model import CafeModel
+
+
+# –––––––––––––––––– SQLITE FTS5 INDEX –––––––––––––––––– #
+# External-content FTS5 table over cafes.title / cafes.description, kept in sync by triggers.
+# Not part of Base.metadata: created next to `cafes` by create_all and by the Alembic migration.
+
+CAFE_FTS_TABLE = 'cafes_fts'
+
+CAFE_FTS_CREATE_STATEMENTS: List[str] = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {CAFE_FTS_TABLE} USING fts5(
+        title, description, content='cafes', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {CAFE_FTS_TABLE}_ai AFTER INSERT ON cafes BEGIN
+        INSERT INTO {CAFE_FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {CAFE_FTS_TABLE}_ad AFTER DELETE ON cafes BEGIN
+        INSERT INTO {CAFE_FTS_TABLE}({CAFE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {CAFE_FTS_TABLE}_au AFTER UPDATE OF title, description ON cafes BEGIN
+        INSERT INTO {CAFE_FTS_TABLE}({CAFE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {CAFE_FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+CAFE_FTS_DROP_STATEMENTS: List[str] = [
+    f'DROP TRIGGER IF EXISTS {CAFE_FTS_TABLE}_au',
+    f'DROP TRIGGER IF EXISTS {CAFE_FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {CAFE_FTS_TABLE}_ai',
+    f'DROP TABLE IF EXISTS {CAFE_FTS_TABLE}',
+]
+
+CAFE_FTS_REBUILD_STATEMENT = f"INSERT INTO {CAFE_FTS_TABLE}({CAFE_FTS_TABLE}) VALUES ('rebuild')"
+
+for _statement in CAFE_FTS_CREATE_STATEMENTS:
+    event.listen(CafeModel.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in CAFE_FTS_DROP_STATEMENTS:
+    event.listen(CafeModel.__table__, 'before_drop', DDL(_statement).execute_if(dialect='sqlite'))
+
+
+# –––––––––––––––––– POSTGRESQL TSVECTOR INDEX –––––––––––––––––– #
+# GIN expression index over the weighted document search_cafe_rows matches on: title as weight A,
+# description as B. The 'simple' configuration neither stems nor drops stop words, like the FTS5
+# tokenizer above; unlike it, accents are not folded (that would take the unaccent extension).
+# Being an index over cafes' own columns, it needs no triggers to stay in sync.
+
+CAFE_SEARCH_INDEX = 'idx_cafe_search_vector'
+# Must stay textually identical in queries, or PostgreSQL will not match it to the index
+CAFE_SEARCH_VECTOR_SQL = ("setweight(to_tsvector('simple', title), 'A') || "
+                          "setweight(to_tsvector('simple', description), 'B')")
+CAFE_SEARCH_INDEX_CREATE_STATEMENT = (
+    f'CREATE INDEX IF NOT EXISTS {CAFE_SEARCH_INDEX} ON cafes USING gin (({CAFE_SEARCH_VECTOR_SQL}))')
+
+event.listen(CafeModel.__table__, 'after_create',
+             DDL(CAFE_SEARCH_INDEX_CREATE_STATEMENT).execute_if(dialect='postgresql'))
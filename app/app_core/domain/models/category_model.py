@@ -1,5 +1,5 @@
 from __future__ import annotations
-from app.infrastructure.database import Base
+from app.infrastructure.database import Base, RELATIONSHIP_LAZY
 from typing import List, TYPE_CHECKING
 from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -17,5 +17,5 @@ class CategoryModel(Base):
     name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
 
     cafe_associations: Mapped[List[CafeCategoryModel]] = relationship(
-        back_populates="category", cascade="all, delete-orphan"
+        back_populates="category", cascade="all, delete-orphan", lazy=RELATIONSHIP_LAZY
     )
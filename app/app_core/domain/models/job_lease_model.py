@@ -0,0 +1,19 @@
+from sqlalchemy import Float, String, event, insert
+from sqlalchemy.orm import Mapped, mapped_column
+from app.infrastructure.database import Base
+from app.infrastructure.job_lease import LEASED_JOBS
+
+
+class JobLeaseModel(Base):
+    """Which process may run a periodic job until when; see app.infrastructure.job_lease."""
+    __tablename__ = 'job_leases'
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    # Unix time the current lease ends; 0 for a job never claimed
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default='0')
+
+
+@event.listens_for(JobLeaseModel.__table__, 'after_create')
+def _seed_job_leases(target, connection, **_kw) -> None:
+    # Claims only update existing rows, so create_all seeds them like the migration does
+    connection.execute(insert(target), [{'name': name, 'expires_at': 0.0} for name in LEASED_JOBS])
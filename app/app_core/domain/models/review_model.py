@@ -1,25 +1,103 @@
 from __future__ import annotations
+import uuid
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
-from app.infrastructure.database import Base
-from sqlalchemy import Index, ForeignKey, Integer, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from app.infrastructure.database import Base, RELATIONSHIP_LAZY
+from app.infrastructure.etag import bump_table_version
+from sqlalchemy import DateTime, Index, ForeignKey, Integer, Text, column, event, inspect, table, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.orm import Mapped, Session, mapped_column, object_session, relationship
+from fastapi_users_db_sqlalchemy.generics import GUID
 
 
 if TYPE_CHECKING:
     from app.app_core.domain.models.cafe_model import CafeModel
 
 
+class current_timestamp_default(FunctionElement):
+    """
+    Server-side "now" for created_at. On SQLite it is rendered in the text format SQLAlchemy itself
+    writes ('YYYY-MM-DD HH:MM:SS.ffffff'): CURRENT_TIMESTAMP has no fraction, and since SQLite
+    compares the column as text, such rows would sort before the keyset cursors bound against them.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(current_timestamp_default)
+def _current_timestamp_default(_element, _compiler, **_kw) -> str:
+    return 'now()'
+
+
+@compiles(current_timestamp_default, 'sqlite')
+def _current_timestamp_default_sqlite(_element, _compiler, **_kw) -> str:
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
 class ReviewModel(Base):
     __tablename__ = 'reviews'
     __table_args__ = (
-        Index('idx_review_cafe_id', 'cafe_id'),
+        # Serves both "reviews of a cafe" and its newest-first keyset pages
+        Index('idx_review_cafe_created_at', 'cafe_id', 'created_at'),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     cafe_id: Mapped[int] = mapped_column(ForeignKey('cafes.id'), nullable=False)
-    user_id: Mapped[PG_UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    # Same type as users.id: outside PostgreSQL both sides must store the UUID as the same string
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID, ForeignKey('users.id'), nullable=False)
     rating: Mapped[int] = mapped_column(Integer, nullable=False)
     comment: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Set in Python so a freshly added review needs no refresh to be returned
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False,
+                                                 default=lambda: datetime.now(timezone.utc),
+                                                 server_default=current_timestamp_default())
+
+    cafe: Mapped[CafeModel] = relationship(back_populates='reviews', lazy=RELATIONSHIP_LAZY)
+
+
+# –––––––––––––––––– RATING AGGREGATES –––––––––––––––––– #
+# cafes.rating_sum / cafes.rating_count are adjusted in the same flush as the review row.
+# Only ORM unit-of-work writes are covered: bulk Core DELETE/UPDATE on reviews bypasses these hooks.
+
+_cafes = table('cafes', column('id'), column('rating_sum'), column('rating_count'))
+
+
+def _apply_rating_delta(session: Session, connection: Connection, cafe_id: int, rating_delta: int,
+                        count_delta: int) -> None:
+    if not rating_delta and not count_delta:
+        return
+    connection.execute(
+        update(_cafes).where(_cafes.c.id == cafe_id).values(
+            rating_sum=_cafes.c.rating_sum + rating_delta,
+            rating_count=_cafes.c.rating_count + count_delta,
+        )
+    )
+    # average_rating is part of every cafe response
+    bump_table_version(session, 'cafes')
+
+
+@event.listens_for(ReviewModel, 'after_insert')
+def _review_inserted(_mapper, connection: Connection, target: ReviewModel) -> None:
+    _apply_rating_delta(object_session(target), connection, target.cafe_id, target.rating, 1)
+
+
+@event.listens_for(ReviewModel, 'after_update')
+def _review_updated(_mapper, connection: Connection, target: ReviewModel) -> None:
+    state = inspect(target)
+    session = state.session
+    rating_history = state.attrs.rating.history
+    cafe_history = state.attrs.cafe_id.history
+    old_rating = rating_history.deleted[0] if rating_history.deleted else target.rating
+    old_cafe_id = cafe_history.deleted[0] if cafe_history.deleted else target.cafe_id
+    if old_cafe_id != target.cafe_id:
+        _apply_rating_delta(session, connection, old_cafe_id, -old_rating, -1)
+        _apply_rating_delta(session, connection, target.cafe_id, target.rating, 1)
+    else:
+        _apply_rating_delta(session, connection, target.cafe_id, target.rating - old_rating, 0)
+
 
-    cafe: Mapped[CafeModel] = relationship(back_populates='reviews')
+@event.listens_for(ReviewModel, 'after_delete')
+def _review_deleted(_mapper, connection: Connection, target: ReviewModel) -> None:
+    _apply_rating_delta(object_session(target), connection, target.cafe_id, -target.rating, -1)
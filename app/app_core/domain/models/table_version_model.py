@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, String, event, insert
+from sqlalchemy.orm import Mapped, mapped_column
+from app.infrastructure.database import Base
+from app.infrastructure.etag import VERSIONED_TABLES
+
+
+class TableVersionModel(Base):
+    """Write counter per table, bumped by the writing transaction; see app.infrastructure.etag."""
+    __tablename__ = 'table_versions'
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default='0')
+
+
+@event.listens_for(TableVersionModel.__table__, 'after_create')
+def _seed_table_versions(target, connection, **_kw) -> None:
+    # Bumps only update existing rows, so create_all seeds them like the migration does
+    connection.execute(insert(target), [{'name': name, 'version': 0} for name in VERSIONED_TABLES])
@@ -0,0 +1,16 @@
+import re
+import unicodedata
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(value: str | None) -> str:
+    """
+    Search key for free-text values such as city names: case-folded, combining marks stripped,
+    whitespace collapsed. 'Café  Central ' -> 'cafe central', 'Київ' -> 'киів'.
+    """
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value.casefold())
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WHITESPACE_RE.sub(' ', stripped).strip()
@@ -0,0 +1,55 @@
+from typing import List, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import MultiLabelBinarizer, normalize
+
+# Share of the feature vector's weight given to categories (the text part gets the rest)
+CATEGORY_WEIGHT = 0.3
+
+
+def _weighted(features: sparse.csr_matrix, weight: float) -> sparse.csr_matrix:
+    # normalize() refuses a matrix without columns, e.g. the text part of an all-stop-word catalog
+    return normalize(features) * np.sqrt(weight) if features.shape[1] else features
+
+
+def cafe_features(titles: Sequence[str], descriptions: Sequence[str],
+                  categories: Sequence[List[str]]) -> sparse.csr_matrix:
+    """
+    One L2-normalized sparse row per cafe: TF-IDF of title + description, concatenated with a
+    one-hot of its category names, weighted so that cosine similarity mixes the two.
+    """
+    # The title is repeated so its words weigh more than one mention in a long description
+    documents = [f'{title} {title} {description or ""}' for title, description in zip(titles, descriptions)]
+    try:
+        text = TfidfVectorizer(stop_words='english', sublinear_tf=True, min_df=1).fit_transform(documents)
+    except ValueError:
+        # "empty vocabulary": no documents, or only stop words in all of them; the categories remain
+        text = sparse.csr_matrix((len(documents), 0), dtype=np.float64)
+    one_hot = sparse.csr_matrix(MultiLabelBinarizer(sparse_output=True).fit_transform(categories), dtype=np.float64)
+    return sparse.hstack([
+        _weighted(text, 1 - CATEGORY_WEIGHT),
+        _weighted(one_hot, CATEGORY_WEIGHT),
+    ], format='csr', dtype=np.float64)
+
+
+def nearest_neighbours(features: sparse.csr_matrix, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-``k`` most similar other rows for every row: (positions, cosine similarities), shape (n, k),
+    best first. Rows with fewer than ``k`` other rows are padded with position -1 and similarity 0.
+    """
+    n = features.shape[0]
+    k_found = min(k, n - 1)
+    positions = np.full((n, k), -1, dtype=np.int64)
+    similarities = np.zeros((n, k), dtype=np.float32)
+    if k_found <= 0 or features.shape[1] == 0:
+        return positions, similarities
+    model = NearestNeighbors(n_neighbors=k_found + 1, metric='cosine', algorithm='brute').fit(features)
+    distances, found = model.kneighbors(features)
+    # Move each row itself to the end (it is normally first, but exact duplicates may tie with it)
+    # with a stable sort, then keep the first k_found: the k_found best other rows, best first
+    order = np.argsort(found == np.arange(n)[:, None], axis=1, kind='stable')[:, :k_found]
+    positions[:, :k_found] = np.take_along_axis(found, order, axis=1)
+    similarities[:, :k_found] = 1 - np.take_along_axis(distances, order, axis=1)
+    return positions, similarities
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, model_validator, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class CafeBaseSchema(BaseModel):
@@ -7,6 +7,14 @@ class CafeBaseSchema(BaseModel):
     city: str
     description: Optional[str] = None
     image_url: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+    @model_validator(mode='after')
+    def coordinates_together(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError('latitude and longitude must be given together')
+        return self
 
 
 class CafeCreateSchema(CafeBaseSchema):
@@ -25,9 +33,17 @@ class CafeUpdateSchema(BaseModel):
     city: Optional[str] = None
     description: Optional[str] = None
     image_url: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     best_for: Optional[str] = None
     also_good_for: Optional[List[str]] = None
 
+    @model_validator(mode='after')
+    def coordinates_together(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError('latitude and longitude must be given together')
+        return self
+
     @model_validator(mode='after')
     def no_duplicate_best_for(self):
         if self.best_for and self.also_good_for and self.best_for in self.also_good_for:
@@ -35,10 +51,24 @@ class CafeUpdateSchema(BaseModel):
         return self
 
 
+# GET /cafes orderings: insertion order, or best ranking_score first
+CafeSort = Literal['id', 'ranking']
+
+
+class CafeFilterSchema(BaseModel):
+    city: Optional[str] = None
+    city_match: Literal['prefix', 'contains'] = 'prefix'
+    best_for: Optional[str] = None
+    # 'any': best_for also matches cafes that are only also good for the category (listed after the rest)
+    best_for_match: Literal['primary', 'any'] = 'primary'
+    also_good_for: List[str] = Field(default_factory=list)
+
+
 class CafeResponseSchema(CafeBaseSchema):
     id: int
     image_url: Optional[str] = None
     average_rating: float = 0.0
+    ranking_score: float = 0.0
     best_for: Optional[str] = None
     also_good_for: List[str] = Field(default_factory=list)
 
@@ -55,9 +85,15 @@ class CafeResponseSchema(CafeBaseSchema):
                 'city': getattr(data, 'city', None),
                 'description': getattr(data, 'description', None),
                 'image_url': getattr(data, 'image_url', None),
-                'average_rating': getattr(data, 'average_rating', 0.0)
+                'latitude': getattr(data, 'latitude', None),
+                'longitude': getattr(data, 'longitude', None),
+                'average_rating': getattr(data, 'average_rating', 0.0),
+                'ranking_score': getattr(data, 'ranking_score', 0.0)
             }
             category_associations = getattr(data, 'category_associations', None)
+        elif 'category_associations' not in data:
+            # Already flat (e.g. a projected row from cafe_repository.get_cafe_rows)
+            return data
         else:
             processed_data = data.copy()
             category_associations = data.get('category_associations', None)
@@ -76,3 +112,32 @@ class CafeResponseSchema(CafeBaseSchema):
         if 'average_rating' not in processed_data:
             processed_data['average_rating'] = 0.0
         return processed_data
+
+
+class FacetCountSchema(BaseModel):
+    value: str
+    count: int
+
+
+class CafeFacetsSchema(BaseModel):
+    # Each list is ordered by count, largest first
+    best_for: List[FacetCountSchema] = Field(default_factory=list)
+    also_good_for: List[FacetCountSchema] = Field(default_factory=list)
+    city: List[FacetCountSchema] = Field(default_factory=list)
+
+
+class CafeBulkItemResultSchema(BaseModel):
+    index: int
+    status: Literal['created', 'updated', 'invalid']
+    id: Optional[int] = None
+    errors: List[str] = Field(default_factory=list)
+
+
+class SimilarCafeSchema(CafeResponseSchema):
+    # Cosine similarity of the text and category features, 0..1
+    similarity: float
+
+
+class NearbyCafeSchema(CafeResponseSchema):
+    # Great-circle distance from the searched point
+    distance_m: float
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class CitySuggestionSchema(BaseModel):
+    name: str
+    cafe_count: int
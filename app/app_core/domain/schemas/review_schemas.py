@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class ReviewCreateSchema(BaseModel):
@@ -17,3 +17,9 @@ class ReviewResponseSchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @field_validator('created_at')
+    @classmethod
+    def assume_utc(cls, value: datetime) -> datetime:
+        # SQLite hands back stored UTC timestamps without their offset
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
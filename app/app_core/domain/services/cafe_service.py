@@ -1,50 +1,245 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.app_core.domain.models.cafe_model import CafeModel
-from app.app_core.domain.schemas.cafe_schemas import CafeCreateSchema, CafeUpdateSchema  # Только для input
+from fastapi import HTTPException
+from pydantic import ValidationError
+from app.app_core.domain.models.cafe_model import normalize_city
+from app.app_core.domain.schemas.cafe_schemas import (
+    CafeBulkItemResultSchema, CafeCreateSchema, CafeFacetsSchema, CafeFilterSchema, CafeResponseSchema, CafeSort,
+    CafeUpdateSchema, FacetCountSchema, NearbyCafeSchema, SimilarCafeSchema)
 from app.app_core.repositories import cafe_repository
-from typing import List
+from app.app_core.repositories.cafe_repository import CAFE_CATALOG_TABLES
+from app.infrastructure.etag import table_version
+from app.app_core.domain.geo import covering_cells, haversine_m
+from app.app_core.domain.services.category_registry import category_registry
+from app.app_core.domain.services.similarity_index import similarity_index
+from app.app_core.domain.services.city_index import city_index
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import json
+import numpy as np
 import logging
+import zlib
 
 logger = logging.getLogger(__name__)
 
+EXPORT_CHUNK_SIZE = 64 * 1024
 
-async def create_cafe(db: AsyncSession, cafe_data: CafeCreateSchema, check_existing: bool = True) -> CafeModel:
-    if check_existing:
-        existing = await cafe_repository.get_cafe_by_title_and_city(db, cafe_data.title, cafe_data.city or 'Unknown')
-        if existing:
-            logger.info(
-                f"Cafe '{cafe_data.title}' in '{cafe_data.city or 'Unknown'}' already exists - returning existing")
-            return existing
-    cafe = CafeModel(
-        title=cafe_data.title,
-        city=cafe_data.city or "Unknown",
-        description=cafe_data.description
-    )
-    created = await cafe_repository.add_cafe(db, cafe)
-    logger.info(f"Cafe '{created.title}' in '{created.city}' created successfully")
-    return created
 
+async def resolve_category_ids(db: AsyncSession, names: List[str]) -> Dict[str, int]:
+    """Category name -> id from the in-memory registry; unknown names are a 422."""
+    category_ids = await category_registry.resolve(db, names)
+    unknown = [name for name in names if name not in category_ids]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown categories: {', '.join(unknown)}")
+    return category_ids
 
-async def get_all_cafes(db: AsyncSession, skip: int = 0, limit: int = 30) -> List[CafeModel]:
-    return await cafe_repository.get_all_cafes(db, skip, limit)
 
+def _cafe_row(cafe_data: CafeCreateSchema) -> Dict[str, Any]:
+    return {
+        'title': cafe_data.title,
+        'city': cafe_data.city or 'Unknown',
+        'description': cafe_data.description,
+        'image_url': cafe_data.image_url,
+        'latitude': cafe_data.latitude,
+        'longitude': cafe_data.longitude,
+    }
 
-async def get_cafe(db: AsyncSession, cafe_id: int) -> CafeModel | None:
-    return await cafe_repository.get_cafe_by_id(db, cafe_id)
 
+def _category_pairs(cafe_data: CafeCreateSchema, category_ids: Dict[str, int]) -> List[Tuple[int, bool]]:
+    return [
+        (category_ids[name], name == cafe_data.best_for)
+        for name in dict.fromkeys([cafe_data.best_for, *cafe_data.also_good_for])
+    ]
 
-async def update_cafe(db: AsyncSession, cafe_id: int, cafe_data: CafeUpdateSchema) -> CafeModel | None:
-    cafe = await cafe_repository.get_cafe_by_id(db, cafe_id)
-    if not cafe:
+
+async def create_cafe(db: AsyncSession, cafe_data: CafeCreateSchema,
+                      update_existing: bool = False) -> CafeResponseSchema:
+    """
+    Create the cafe in a single upsert. If (title, city) already exists the existing cafe is returned,
+    unchanged unless ``update_existing`` asks for its description, image and categories to be replaced.
+
+    A new cafe's response is built from the request itself and the id the INSERT returned; only an
+    existing cafe (whose rating we do not know) is read back.
+    """
+    category_ids = await resolve_category_ids(db, [cafe_data.best_for, *cafe_data.also_good_for])
+    row = _cafe_row(cafe_data)
+    [(cafe_id, created)] = await cafe_repository.upsert_cafes(
+        db, [row], [_category_pairs(cafe_data, category_ids)], update_existing)
+    if created:
+        logger.info(f"Cafe '{cafe_data.title}' in '{cafe_data.city}' created successfully")
+        city_index.add(row['city'])
+        return CafeResponseSchema(id=cafe_id, **row, best_for=cafe_data.best_for,
+                                  also_good_for=list(dict.fromkeys(cafe_data.also_good_for)))
+    logger.info(f"Cafe '{cafe_data.title}' in '{cafe_data.city}' already exists - "
+                f"{'updated' if update_existing else 'returning existing'}")
+    return CafeResponseSchema.model_validate(await cafe_repository.get_cafe_row_by_id(db, cafe_id))
+
+
+async def get_cafe_rows(db: AsyncSession, skip: int = 0, limit: int = 30,
+                        after_id: int | None = None, filters: CafeFilterSchema | None = None,
+                        sort: CafeSort = 'id', after_score: float | None = None,
+                        after_rank: int | None = None) -> List[Dict[str, Any]]:
+    return await cafe_repository.get_cafe_rows(db, skip, limit, after_id, filters, sort, after_score, after_rank)
+
+
+async def search_cafes(db: AsyncSession, query: str, skip: int = 0, limit: int = 30) -> List[Dict[str, Any]]:
+    return await cafe_repository.search_cafe_rows(db, query, skip, limit)
+
+
+async def get_cafe_facets(db: AsyncSession, filters: CafeFilterSchema) -> CafeFacetsSchema:
+    """Facet counts for the filter set, cached until the catalog tables change (or the TTL runs out)."""
+    cache = cafe_repository.cafe_facets_cache
+    key = (table_version(*CAFE_CATALOG_TABLES), normalize_city(filters.city), filters.city_match,
+           filters.best_for, filters.best_for_match, tuple(sorted(set(filters.also_good_for))))
+    facets = cache.get(key)
+    if facets is not None:
+        return facets
+    facets = CafeFacetsSchema()
+    for facet, value, count in sorted(await cafe_repository.get_cafe_facets(db, filters), key=lambda row: -row[2]):
+        getattr(facets, facet).append(FacetCountSchema(value=value, count=count))
+    cache.set(key, facets)
+    return facets
+
+
+async def get_cafe_payload(db: AsyncSession, cafe_id: int) -> bytes | None:
+    """Read-through cache in front of the cafe detail: returns the JSON-encoded CafeResponseSchema."""
+    cache = cafe_repository.cafe_response_cache
+    payload = cache.get(cafe_id)
+    if payload is not None:
+        return payload
+    generation = cache.generation
+    row = await cafe_repository.get_cafe_row_by_id(db, cafe_id)
+    if row is None:
         return None
-    if cafe_data.title is not None:
-        cafe.title = cafe_data.title
-    if cafe_data.city is not None:
-        cafe.city = cafe_data.city
-    if cafe_data.description is not None:
-        cafe.description = cafe_data.description
-    return await cafe_repository.update_existing_cafe(db, cafe)
+    payload = CafeResponseSchema.model_validate(row).model_dump_json().encode()
+    cache.set(cafe_id, payload, generation)
+    return payload
+
+
+async def get_nearby_cafes(db: AsyncSession, latitude: float, longitude: float, radius_m: float,
+                           limit: int = 30) -> List[NearbyCafeSchema]:
+    """
+    Cafes within ``radius_m`` of the point, nearest first: candidates come from the geohash cells
+    covering the circle, exact distances from one vectorized haversine over all of them.
+    """
+    ids, latitudes, longitudes = await cafe_repository.get_cafe_locations(
+        db, covering_cells(latitude, longitude, radius_m))
+    distances = haversine_m(latitude, longitude, latitudes, longitudes)
+    inside = np.flatnonzero(distances <= radius_m)
+    if len(inside) > limit:
+        inside = inside[np.argpartition(distances[inside], limit)[:limit]]
+    nearest = inside[np.argsort(distances[inside], kind='stable')]
+    distance = dict(zip(ids[nearest].tolist(), distances[nearest].tolist()))
+    rows = await cafe_repository.get_cafe_rows_by_ids(db, list(distance))
+    return [NearbyCafeSchema(**row, distance_m=distance[row['id']]) for row in rows]
+
+
+async def get_similar_cafes(db: AsyncSession, cafe_id: int, limit: int = 10) -> List[SimilarCafeSchema]:
+    """Neighbours from the precomputed similarity index, most similar first."""
+    if not similarity_index.loaded:
+        raise HTTPException(status_code=503, detail='Similar cafes index is not built yet')
+    neighbours = similarity_index.lookup(cafe_id, limit)
+    if neighbours is None:
+        if not await cafe_repository.cafe_exists(db, cafe_id):
+            raise HTTPException(status_code=404, detail='Cafe not found')
+        # Created after the last rebuild
+        return []
+    similarity = dict(neighbours)
+    rows = await cafe_repository.get_cafe_rows_by_ids(db, list(similarity))
+    return [SimilarCafeSchema(**row, similarity=similarity[row['id']]) for row in rows]
+
+
+async def update_cafe(db: AsyncSession, cafe_id: int, cafe_data: CafeUpdateSchema) -> CafeResponseSchema | None:
+    """
+    Partial update. Categories are only rewritten when best_for or also_good_for is sent; the one
+    that is not sent keeps its current value.
+    """
+    values = cafe_data.model_dump(include={'title', 'city', 'description', 'image_url', 'latitude', 'longitude'}, exclude_none=True)
+    categories = None
+    # Only a city change needs the old value, to move the cafe between city_index entries
+    old_city = await cafe_repository.get_cafe_city(db, cafe_id) if 'city' in values else None
+    if cafe_data.best_for is not None or cafe_data.also_good_for is not None:
+        best_for, also_good_for = cafe_data.best_for, cafe_data.also_good_for
+        if best_for is None or also_good_for is None:
+            current = await cafe_repository.get_cafe_categories(db, cafe_id)
+            if best_for is None:
+                best_for = next((name for name, is_best in current if is_best), None)
+            if also_good_for is None:
+                also_good_for = [name for name, is_best in current if not is_best and name != best_for]
+        if best_for is not None and best_for in also_good_for:
+            raise HTTPException(status_code=422,
+                                detail=f"Category '{best_for}' duplicated in best_for and also_good_for")
+        names = list(dict.fromkeys([best_for, *also_good_for] if best_for is not None else also_good_for))
+        category_ids = await resolve_category_ids(db, names)
+        categories = [(category_ids[name], name, name == best_for) for name in names]
+    payload = await cafe_repository.update_existing_cafe(db, cafe_id, values, categories)
+    if payload is not None and old_city is not None and old_city != payload['city']:
+        city_index.remove(old_city)
+        city_index.add(payload['city'])
+    return CafeResponseSchema.model_validate(payload) if payload is not None else None
+
+
+async def export_cafes_ndjson(db: AsyncSession, compress: bool = False) -> AsyncIterator[bytes]:
+    """The whole catalog as NDJSON (one cafe per line), in ~64 KiB chunks, optionally gzip-compressed."""
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+    buffer = bytearray()
+    async for cafe in cafe_repository.stream_cafe_rows(db):
+        buffer += json.dumps(cafe, ensure_ascii=False).encode()
+        buffer += b'\n'
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+    tail = bytes(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
+async def bulk_save_cafes(db: AsyncSession, items: List[Dict[str, Any]]) -> List[CafeBulkItemResultSchema]:
+    """Validate every item on its own, resolve all categories at once, then save the valid ones together."""
+    results: List[CafeBulkItemResultSchema | None] = [None] * len(items)
+    valid: List[tuple[int, CafeCreateSchema]] = []
+    for index, item in enumerate(items):
+        try:
+            cafe_data = CafeCreateSchema.model_validate(item)
+        except ValidationError as e:
+            errors = [': '.join(filter(None, ['.'.join(map(str, err['loc'])), err['msg']])) for err in e.errors()]
+            results[index] = CafeBulkItemResultSchema(index=index, status='invalid', errors=errors)
+            continue
+        if cafe_data.description is None:
+            # cafes.description is NOT NULL: reject the item rather than abort the whole transaction
+            results[index] = CafeBulkItemResultSchema(index=index, status='invalid', errors=['description: Field required'])
+            continue
+        valid.append((index, cafe_data))
 
+    names = {name for _, cafe_data in valid for name in [cafe_data.best_for, *cafe_data.also_good_for]}
+    category_ids = await category_registry.resolve(db, names)
+    rows, categories, indexes = [], [], []
+    # Keys of the items actually going into rows: a rejected item does not shadow a later valid one
+    seen = set()
+    for index, cafe_data in valid:
+        unknown = [name for name in [cafe_data.best_for, *cafe_data.also_good_for] if name not in category_ids]
+        if unknown:
+            results[index] = CafeBulkItemResultSchema(
+                index=index, status='invalid', errors=[f"Unknown categories: {', '.join(unknown)}"])
+            continue
+        key = (cafe_data.title, cafe_data.city or 'Unknown')
+        if key in seen:
+            results[index] = CafeBulkItemResultSchema(
+                index=index, status='invalid', errors=['Duplicate title and city within this request'])
+            continue
+        seen.add(key)
+        rows.append(_cafe_row(cafe_data))
+        categories.append(_category_pairs(cafe_data, category_ids))
+        indexes.append(index)
 
-async def get_cafe_by_tc(db: AsyncSession, cafe_data: CafeCreateSchema) -> CafeModel | None:
-    return await cafe_repository.get_cafe_by_title_and_city(db, cafe_data.title, cafe_data.city or 'Unknown')
+    if rows:
+        saved = await cafe_repository.upsert_cafes(db, rows, categories, update_existing=True)
+        for index, row, (cafe_id, created) in zip(indexes, rows, saved):
+            results[index] = CafeBulkItemResultSchema(index=index, status='created' if created else 'updated', id=cafe_id)
+            if created:
+                city_index.add(row['city'])
+        logger.info(f"Bulk import: {sum(created for _, created in saved)} created, "
+                    f"{sum(not created for _, created in saved)} updated, {len(items) - len(saved)} invalid")
+    return results
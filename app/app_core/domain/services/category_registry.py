@@ -0,0 +1,77 @@
+import time
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.app_configs import Configs
+from app.app_core.repositories import category_repository
+from app.infrastructure.etag import on_table_version_change
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryRegistry:
+    """
+    Process-wide name <-> id map of the categories table.
+
+    The table is tiny and only ever grows, so it is loaded once and then patched on writes made by
+    this process. Lookups that miss (e.g. a category added by another worker) trigger one reload,
+    and the whole map is reloaded after ``max_age`` seconds or once another process is seen writing
+    to the table, the same moment the categories ETag moves.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._by_name: Dict[str, int] = {}
+        self._by_id: Dict[int, str] = {}
+        self._loaded_at: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age
+
+    async def load(self, db: AsyncSession) -> None:
+        categories = await category_repository.get_all_categories(db)
+        self._by_name = {category.name: category.id for category in categories}
+        self._by_id = {category.id: category.name for category in categories}
+        self._loaded_at = time.monotonic()
+        logger.info(f'Category registry loaded: {len(self._by_name)} categories')
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self.loaded:
+            await self.load(db)
+
+    def invalidate(self) -> None:
+        """Reload on the next ensure_loaded."""
+        self._loaded_at = None
+
+    def add(self, category_id: int, name: str) -> None:
+        self._by_name[name] = category_id
+        self._by_id[category_id] = name
+
+    def id_for(self, name: str) -> int | None:
+        return self._by_name.get(name)
+
+    def name_for(self, category_id: int) -> str | None:
+        return self._by_id.get(category_id)
+
+    def items(self) -> List[Tuple[int, str]]:
+        return sorted(self._by_id.items())
+
+    async def resolve(self, db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+        """Map names to ids; names that are still unknown after a reload are left out."""
+        await self.ensure_loaded(db)
+        names = set(names)
+        if not names <= self._by_name.keys():
+            await self.load(db)
+        return {name: self._by_name[name] for name in names if name in self._by_name}
+
+
+category_registry = CategoryRegistry(max_age=Configs.CATEGORY_REGISTRY_MAX_AGE)
+
+
+def _reload_categories_written_elsewhere(changed: set) -> None:
+    if 'categories' in changed:
+        category_registry.invalidate()
+
+
+on_table_version_change(_reload_categories_written_elsewhere)
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.app_core.domain.models.category_model import CategoryModel
 from app.app_core.repositories import category_repository
-from app.app_core.domain.schemas.category_schemas import CategoryCreateSchema
+from app.app_core.domain.schemas.category_schemas import CategoryCreateSchema, CategoryResponseSchema
+from app.app_core.domain.services.category_registry import category_registry
 from typing import List
 import logging
 
@@ -9,17 +10,24 @@ logger = logging.getLogger(__name__)
 
 
 async def create_category(db: AsyncSession, category_data: CategoryCreateSchema) -> CategoryModel:
-    existing = await category_repository.get_category_by_name(db, category_data.name)
+    existing = await get_existing_category(db, category_data)
     if existing:
         logger.info(f"Category '{category_data.name}' already exists - skipping")
         return existing
     category = CategoryModel(name=category_data.name)
-    return await category_repository.add_category(db, category)
+    created = await category_repository.add_category(db, category)
+    category_registry.add(created.id, created.name)
+    return created
 
 
-async def get_categories(db: AsyncSession) -> List[CategoryModel]:
-    return await category_repository.get_all_categories(db)
+async def get_categories(db: AsyncSession) -> List[CategoryResponseSchema]:
+    await category_registry.ensure_loaded(db)
+    return [CategoryResponseSchema(id=category_id, name=name) for category_id, name in category_registry.items()]
 
 
 async def get_existing_category(db: AsyncSession, category_data: CategoryCreateSchema) -> CategoryModel | None:
-    return await category_repository.get_category_by_name(db, category_data.name)
+    # Answered from the registry: a detached, read-only CategoryModel, never to be added to a session
+    category_ids = await category_registry.resolve(db, [category_data.name])
+    if category_data.name not in category_ids:
+        return None
+    return CategoryModel(id=category_ids[category_data.name], name=category_data.name)
@@ -0,0 +1,96 @@
+import bisect
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.app_configs import Configs
+from app.app_core.domain.models.cafe_model import normalize_city
+from app.app_core.repositories import cafe_repository
+from app.infrastructure.etag import on_table_version_change
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CityIndex:
+    """
+    Process-wide sorted array of normalized city names (see ``normalize_city``) with cafe counts,
+    for prefix lookups: a bisect to the first match, then a walk while the prefix still matches.
+
+    Each key remembers the spellings it was written with and is displayed in the most common one.
+    Cafe writes made by this process patch the index; it is reloaded after ``max_age`` seconds, or
+    once another process is seen writing to the cafes table, to pick up writes from other workers.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._keys: List[str] = []
+        self._spellings: Dict[str, Counter] = {}
+        self._loaded_at: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age
+
+    async def load(self, db: AsyncSession) -> None:
+        spellings: Dict[str, Counter] = {}
+        for city, city_normalized, count in await cafe_repository.get_city_counts(db):
+            spellings.setdefault(city_normalized, Counter())[city] += count
+        self._spellings = spellings
+        self._keys = sorted(spellings)
+        self._loaded_at = time.monotonic()
+        logger.info(f'City index loaded: {len(self._keys)} cities')
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self.loaded:
+            await self.load(db)
+
+    def invalidate(self) -> None:
+        """Reload on the next ensure_loaded; local writes are not patched in until then."""
+        self._loaded_at = None
+
+    def add(self, city: str, count: int = 1) -> None:
+        if self._loaded_at is None:
+            return
+        key = normalize_city(city)
+        if key not in self._spellings:
+            bisect.insort(self._keys, key)
+            self._spellings[key] = Counter()
+        self._spellings[key][city] += count
+
+    def remove(self, city: str, count: int = 1) -> None:
+        key = normalize_city(city)
+        spellings = self._spellings.get(key)
+        if spellings is None:
+            return
+        spellings[city] -= count
+        if spellings[city] <= 0:
+            del spellings[city]
+        if not spellings:
+            del self._spellings[key]
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """(display name, cafe count) of the first ``limit`` cities starting with ``prefix``, by name."""
+        key = normalize_city(prefix)
+        if not key:
+            return []
+        suggestions = []
+        for position in range(bisect.bisect_left(self._keys, key), len(self._keys)):
+            city_key = self._keys[position]
+            if not city_key.startswith(key) or len(suggestions) == limit:
+                break
+            spellings = self._spellings[city_key]
+            suggestions.append((spellings.most_common(1)[0][0], sum(spellings.values())))
+        return suggestions
+
+
+city_index = CityIndex(max_age=Configs.CITY_INDEX_MAX_AGE)
+
+
+def _reload_cities_written_elsewhere(changed: set) -> None:
+    if 'cafes' in changed:
+        city_index.invalidate()
+
+
+on_table_version_change(_reload_cities_written_elsewhere)
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.app_configs import Configs
+from app.app_core.domain.ranking import ranking_scores
+from app.app_core.repositories import cafe_repository
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.job_lease import RANKING_REFRESH_JOB, claim_job
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def recompute_rankings(db: AsyncSession, method: str = Configs.RANKING_METHOD,
+                             tolerance: float = Configs.RANKING_SCORE_TOLERANCE) -> int:
+    """
+    Recompute ranking_score for the whole catalog in one vectorized pass and write back only the
+    cafes whose score moved by more than ``tolerance``. Returns the number of cafes updated.
+    """
+    started = time.perf_counter()
+    ids, sums, counts, current = await cafe_repository.get_rating_arrays(db)
+    loaded = time.perf_counter()
+    scores = ranking_scores(sums, counts, method, Configs.RANKING_PRIOR_WEIGHT)
+    changed = np.abs(scores - current) > tolerance
+    computed = time.perf_counter()
+    if changed.any():
+        await cafe_repository.save_ranking_scores(db, ids[changed], scores[changed])
+    finished = time.perf_counter()
+    # End to end: at catalog scale the load and the write dominate, not the vectorized compute
+    logger.info(f'Ranking ({method}) for {len(ids)} cafes, {int(changed.sum())} changed, in {finished - started:.3f}s '
+                f'(load {loaded - started:.3f}s, compute {computed - loaded:.3f}s, write {finished - computed:.3f}s)')
+    return int(changed.sum())
+
+
+async def refresh_rankings_periodically(interval: float) -> None:
+    """
+    Background loop started from the app lifespan. Review writes only touch rating_sum/rating_count,
+    and the Bayesian prior moves with every review, so scores are refreshed for the whole catalog.
+    Every worker runs this loop; the job lease lets only one of them recompute per interval.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                # Slightly shorter than the interval, so the lease has expired by the next tick
+                if await claim_job(db, RANKING_REFRESH_JOB, interval * 0.9):
+                    await recompute_rankings(db)
+        except Exception:
+            logger.exception('Ranking refresh failed')
+        await asyncio.sleep(interval)
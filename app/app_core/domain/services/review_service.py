@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import List, Tuple
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.app_core.domain.models.review_model import ReviewModel
+from app.app_core.domain.models.user_model import UserModel
+from app.app_core.domain.schemas.review_schemas import ReviewCreateSchema, ReviewResponseSchema
+from app.app_core.repositories import cafe_repository, review_repository
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def create_review(db: AsyncSession, cafe_id: int, review_data: ReviewCreateSchema,
+                        user: UserModel) -> ReviewResponseSchema:
+    # SQLite does not enforce the cafes foreign key
+    if not await cafe_repository.cafe_exists(db, cafe_id):
+        raise HTTPException(status_code=404, detail='Cafe not found')
+    review = ReviewModel(cafe_id=cafe_id, user_id=user.id, rating=review_data.rating, comment=review_data.comment)
+    review = await review_repository.add_review(db, review)
+    logger.info(f"Review {review.id} for cafe {cafe_id} by '{user.username}' created")
+    # id comes back from the INSERT and created_at is set client-side: nothing to reload
+    return ReviewResponseSchema(id=review.id, rating=review.rating, comment=review.comment,
+                                created_at=review.created_at, user_name=user.username)
+
+
+async def get_reviews(db: AsyncSession, cafe_id: int, limit: int = 20,
+                      after: Tuple[datetime, int] | None = None) -> List[ReviewResponseSchema]:
+    reviews = await review_repository.get_cafe_reviews(db, cafe_id, limit, after)
+    if not reviews and after is None and not await cafe_repository.cafe_exists(db, cafe_id):
+        raise HTTPException(status_code=404, detail='Cafe not found')
+    return [ReviewResponseSchema.model_validate(review) for review in reviews]
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import tempfile
+import time
+from typing import List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.app_configs import Configs
+from app.app_core.domain.recommendation import cafe_features, nearest_neighbours
+from app.app_core.repositories import cafe_repository
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.etag import CAFE_CONTENT_VERSION, bump_local_table_version, process_local_table, table_version
+from app.infrastructure.job_lease import SIMILAR_INDEX_JOB, claim_job
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# ETag "table" of GET /cafes/{id}/similar: bumped whenever a new index is swapped in
+SIMILAR_CAFES_TABLE = process_local_table('similar_cafes')
+
+# (ids, neighbours, similarities, content version) as stored by SimilarityIndex.save
+SavedIndex = Tuple[np.ndarray, np.ndarray, np.ndarray, str | None]
+
+
+class SimilarityIndex:
+    """
+    Precomputed "similar cafes": for every cafe id (sorted ``ids``) the ids of its ``k`` most similar
+    cafes and their cosine similarities, as dense NumPy arrays. A lookup is one binary search and a
+    row slice; nothing is computed per request. Built off the event loop and swapped in whole.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.ids = np.empty(0, dtype=np.int64)
+        self.neighbours = np.empty((0, k), dtype=np.int64)
+        self.similarities = np.empty((0, k), dtype=np.float32)
+        self.built_version: str | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return len(self.ids) > 0
+
+    def lookup(self, cafe_id: int, limit: int | None = None) -> List[Tuple[int, float]] | None:
+        """(cafe_id, similarity) pairs, most similar first; None if the cafe is not indexed (yet)."""
+        position = int(np.searchsorted(self.ids, cafe_id))
+        if position == len(self.ids) or self.ids[position] != cafe_id:
+            return None
+        neighbours = self.neighbours[position, :limit]
+        similarities = self.similarities[position, :limit]
+        found = neighbours >= 0
+        return list(zip(neighbours[found].tolist(), similarities[found].tolist()))
+
+    def _swap(self, ids: np.ndarray, neighbours: np.ndarray, similarities: np.ndarray) -> None:
+        self.ids, self.neighbours, self.similarities = ids, neighbours, similarities
+        bump_local_table_version(SIMILAR_CAFES_TABLE)
+
+    def _read(self, path: str, version: str | None = None) -> SavedIndex | None:
+        """The arrays and content version saved at ``path``; None if missing, of another k or not at ``version``."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            # The content version the saved index was built at: no rebuild if nothing changed since
+            built_version = str(data['content_version']) if 'content_version' in data.files else None
+            if version is not None and built_version != version:
+                return None
+            if data['neighbours'].shape[1] != self.k:
+                logger.info(f'Similar-cafes index at {path} has k={data["neighbours"].shape[1]}, rebuilding')
+                return None
+            return data['ids'], data['neighbours'], data['similarities'], built_version
+
+    def _install(self, saved: SavedIndex, path: str) -> None:
+        ids, neighbours, similarities, self.built_version = saved
+        self._swap(ids, neighbours, similarities)
+        logger.info(f'Similar-cafes index loaded from {path}: {len(self.ids)} cafes')
+
+    def load(self, path: str) -> bool:
+        saved = self._read(path)
+        if saved is None:
+            return False
+        self._install(saved, path)
+        return True
+
+    def save(self, path: str) -> None:
+        # A unique temporary file next to the target: concurrent saves never write into the same file,
+        # and os.replace stays an atomic rename within one filesystem
+        fd, tmp_path = tempfile.mkstemp(prefix=f'{os.path.basename(path)}.', suffix='.tmp',
+                                        dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez_compressed(file, ids=self.ids, neighbours=self.neighbours, similarities=self.similarities,
+                                    content_version=np.array(self.built_version or ''))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _build(self, ids: np.ndarray, titles: List[str], descriptions: List[str],
+               categories: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        positions, similarities = nearest_neighbours(cafe_features(titles, descriptions, categories), self.k)
+        # Positions -> cafe ids, keeping the -1 padding
+        return np.where(positions >= 0, ids[positions], -1), similarities
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        version = table_version(CAFE_CONTENT_VERSION)
+        ids, titles, descriptions, categories = [], [], [], []
+        # stream_cafe_rows yields in id order, so ids come out sorted for searchsorted
+        async for cafe in cafe_repository.stream_cafe_rows(db):
+            ids.append(cafe['id'])
+            titles.append(cafe['title'])
+            descriptions.append(cafe['description'])
+            categories.append([name for name in [cafe['best_for'], *cafe['also_good_for']] if name])
+        ids = np.array(ids, dtype=np.int64)
+        started = time.perf_counter()
+        if len(ids):
+            # scikit-learn releases the GIL for most of the work; keep it off the event loop either way
+            neighbours, similarities = await asyncio.to_thread(self._build, ids, titles, descriptions, categories)
+        else:
+            neighbours = np.empty((0, self.k), dtype=np.int64)
+            similarities = np.empty((0, self.k), dtype=np.float32)
+        self._swap(ids, neighbours, similarities)
+        self.built_version = version
+        logger.info(f'Similar-cafes index built for {len(ids)} cafes in {time.perf_counter() - started:.2f}s')
+
+    async def refresh(self, path: str, lease: float) -> None:
+        """
+        Bring the index up to date if cafe titles, descriptions or categories changed since it was built.
+        Only the worker that claims the SIMILAR_INDEX_JOB lease (for ``lease`` seconds) rebuilds and
+        saves to ``path``; the others load that file once it holds the current content version, so
+        ``path`` must be shared by the workers.
+        """
+        version = table_version(CAFE_CONTENT_VERSION)
+        if self.built_version == version:
+            return
+        saved = await asyncio.to_thread(self._read, path, version)
+        if saved is not None:
+            self._install(saved, path)
+            return
+        async with AsyncSessionLocal() as db:
+            if await claim_job(db, SIMILAR_INDEX_JOB, lease):
+                await self.rebuild(db)
+                await asyncio.to_thread(self.save, path)
+
+    async def refresh_periodically(self, interval: float, path: str) -> None:
+        """
+        Background loop started from the app lifespan: refresh every ``interval`` s. Reviews and ranking
+        refreshes leave CAFE_CONTENT_VERSION alone and so never trigger a rebuild.
+        """
+        while True:
+            try:
+                # Slightly shorter than the interval, so the lease has expired by the next tick
+                await self.refresh(path, interval * 0.9)
+            except Exception:
+                logger.exception('Similar-cafes index rebuild failed')
+            await asyncio.sleep(interval)
+
+
+similarity_index = SimilarityIndex(k=Configs.SIMILAR_CAFES_K)
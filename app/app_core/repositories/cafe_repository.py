@@ -1,91 +1,584 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.app_core.domain.models.cafe_model import CafeModel
+from app.app_core.domain.models.cafe_model import CafeModel, cafe_geohash, normalize_city
 from app.app_core.domain.models.cafe_category_model import CafeCategoryModel
+from app.app_core.domain.models.category_model import CategoryModel
+from sqlalchemy import (
+    Float, Integer, Select, and_, case, delete, func, insert, literal, not_, or_, text, tuple_, union_all, update)
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import selectinload
 from fastapi import HTTPException
 from sqlalchemy.future import select
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from app.app_core.domain.schemas.cafe_schemas import CafeFilterSchema, CafeSort
+from app.app_core.domain.models.cafe_search_index import CAFE_FTS_TABLE, CAFE_SEARCH_VECTOR_SQL
+from app.infrastructure.cache import TTLCache
+from app.infrastructure.etag import CAFE_CONTENT_VERSION, bump_table_version, on_table_version_change
+from app.infrastructure.db_errors import is_unique_violation
+from app.app_configs import Configs
+import numpy as np
+import re
 
+# Unit separator: cannot appear in a category name typed into the admin UI
+CATEGORY_NAME_SEPARATOR = '\x1f'
+# bm25 column weights for (title, description): a hit in the title outranks one in the description
+FTS_COLUMN_WEIGHTS = (10.0, 1.0)
+# The same on PostgreSQL, as ts_rank_cd weights of the {D, C, B, A} labels (each in 0..1): title is A,
+# description B
+TS_RANK_WEIGHTS = [0.0, 0.0, FTS_COLUMN_WEIGHTS[1] / FTS_COLUMN_WEIGHTS[0], 1.0]
+_FTS_TOKEN_RE = re.compile(r'\w+')
 
-async def add_cafe(db: AsyncSession, cafe: CafeModel) -> CafeModel:
+# Columns a cafe response payload is built from (categories aside)
+_RESPONSE_COLUMNS = (CafeModel.id, CafeModel.title, CafeModel.city, CafeModel.description, CafeModel.image_url,
+                     CafeModel.latitude, CafeModel.longitude, CafeModel.rating_sum, CafeModel.rating_count, CafeModel.ranking_score)
+
+# Rows per SELECT when looking up (title, city) keys of existing cafes
+BULK_LOOKUP_CHUNK_SIZE = 500
+
+# Cafe columns an upsert replaces on an existing (title, city)
+UPSERT_UPDATED_COLUMNS = ('description', 'image_url', 'latitude', 'longitude', 'geohash')
+
+# Cafe columns the similar-cafes features are built from (categories aside)
+CAFE_CONTENT_COLUMNS = ('title', 'description')
+
+# Rows per executemany when writing recomputed ranking scores
+RANKING_UPDATE_CHUNK_SIZE = 10000
+# Rows per server-side cursor fetch when loading the rating arrays
+RATING_FETCH_CHUNK_SIZE = 10000
+
+# Tables a cafe response is built from; their versions make up the cafe endpoints' ETags
+CAFE_CATALOG_TABLES = ('cafes', 'cafe_categories', 'categories')
+
+# Serialized CafeResponseSchema payloads by cafe id; every write below invalidates its cafe
+cafe_response_cache = TTLCache('cafe_responses', maxsize=Configs.CAFE_CACHE_MAXSIZE, ttl=Configs.CAFE_CACHE_TTL)
+# Facet counts by (catalog table versions, filter set): a write moves the versions, so old entries are never hit
+cafe_facets_cache = TTLCache('cafe_facets', maxsize=Configs.CAFE_CACHE_MAXSIZE, ttl=Configs.CAFE_CACHE_TTL)
+
+
+def _drop_responses_written_elsewhere(changed: set) -> None:
+    # Another worker wrote to the catalog and only invalidated its own cache; which cafes it touched is unknown here
+    if changed.intersection(CAFE_CATALOG_TABLES):
+        cafe_response_cache.clear()
+
+
+on_table_version_change(_drop_responses_written_elsewhere)
+
+
+def _category_cafe_ids(names: List[str], is_best: bool | None) -> Select:
+    # Driven by idx_cafe_category_category_id: categories by name -> their cafe_categories rows
+    stmt = (
+        select(CafeCategoryModel.cafe_id)
+        .join(CategoryModel, CategoryModel.id == CafeCategoryModel.category_id)
+        .where(CategoryModel.name.in_(names))
+    )
+    if is_best is None:
+        return stmt
+    return stmt.where(CafeCategoryModel.is_best if is_best else not_(CafeCategoryModel.is_best))
+
+
+def orders_primary_first(filters: CafeFilterSchema | None, sort: CafeSort) -> bool:
+    """Whether a ``best_for_match='any'`` page lists the cafes best for the category before the rest."""
+    return sort == 'id' and filters is not None and bool(filters.best_for) and filters.best_for_match == 'any'
+
+
+def _best_for_rank(name: str):
+    # 0 for cafes best for ``name``, 1 for those only also good for it
+    return case((CafeModel.id.in_(_category_cafe_ids([name], is_best=True)), 0), else_=1)
+
+
+def apply_cafe_filters(stmt: Select, filters: CafeFilterSchema | None) -> Select:
+    if filters is None:
+        return stmt
+    if filters.city:
+        key = normalize_city(filters.city)
+        if key and filters.city_match == 'contains':
+            stmt = stmt.where(CafeModel.city_normalized.contains(key, autoescape=True))
+        elif key:
+            # Range instead of LIKE so the prefix match can seek idx_cafe_city_normalized on any dialect
+            stmt = stmt.where(CafeModel.city_normalized >= key, CafeModel.city_normalized < key + '\U0010ffff')
+    if filters.best_for:
+        is_best = True if filters.best_for_match == 'primary' else None
+        stmt = stmt.where(CafeModel.id.in_(_category_cafe_ids([filters.best_for], is_best=is_best)))
+    if filters.also_good_for:
+        stmt = stmt.where(CafeModel.id.in_(_category_cafe_ids(filters.also_good_for, is_best=False)))
+    return stmt
+
+
+def _also_good_for_aggregate(dialect: str):
+    if dialect == 'postgresql':
+        # A JSON array built server-side arrives as a list (no separator to split on), in association order
+        names = func.json_agg(aggregate_order_by(CategoryModel.name, CafeCategoryModel.id), type_=JSON)
+        return names.filter(not_(CafeCategoryModel.is_best))
+    also_name = case((not_(CafeCategoryModel.is_best), CategoryModel.name))
+    return func.aggregate_strings(also_name, CATEGORY_NAME_SEPARATOR)
+
+
+def _cafe_rows_statement(page=None, order_by=None, dialect: str = 'sqlite'):
+    """
+    Response columns for the cafes in ``page`` (a subquery of cafe ids; all cafes when omitted) with
+    category names aggregated in SQL, so no ORM objects, associations or identity-map entries are built.
+    """
+    order_by = (CafeModel.id,) if order_by is None else order_by
+    best_name = case((CafeCategoryModel.is_best, CategoryModel.name))
+    stmt = (
+        select(
+            CafeModel.id, CafeModel.title, CafeModel.city, CafeModel.description, CafeModel.image_url,
+            CafeModel.latitude, CafeModel.longitude, CafeModel.rating_sum, CafeModel.rating_count, CafeModel.ranking_score,
+            func.max(best_name).label('best_for'),
+            _also_good_for_aggregate(dialect).label('also_good_for'),
+        )
+        .outerjoin(CafeCategoryModel, CafeCategoryModel.cafe_id == CafeModel.id)
+        .outerjoin(CategoryModel, CategoryModel.id == CafeCategoryModel.category_id)
+        .group_by(CafeModel.id)
+        .order_by(*order_by)
+    )
+    if page is not None:
+        stmt = stmt.join(page, page.c.id == CafeModel.id)
+    return stmt
+
+
+def cafe_payload(row, categories: List[Tuple[str, bool]]) -> Dict[str, Any]:
+    """Response payload from a row of ``_RESPONSE_COLUMNS`` and the cafe's (name, is_best) categories."""
+    return {
+        'id': row.id,
+        'title': row.title,
+        'city': row.city,
+        'description': row.description,
+        'image_url': row.image_url,
+        'latitude': row.latitude,
+        'longitude': row.longitude,
+        'average_rating': row.rating_sum / row.rating_count if row.rating_count else 0.0,
+        'ranking_score': row.ranking_score,
+        'best_for': next((name for name, is_best in categories if is_best), None),
+        'also_good_for': [name for name, is_best in categories if not is_best],
+    }
+
+
+def _row_to_payload(row) -> Dict[str, Any]:
+    also_good_for = row.also_good_for
+    if isinstance(also_good_for, str):
+        also_good_for = also_good_for.split(CATEGORY_NAME_SEPARATOR)
+    return {
+        'id': row.id,
+        'title': row.title,
+        'city': row.city,
+        'description': row.description,
+        'image_url': row.image_url,
+        'latitude': row.latitude,
+        'longitude': row.longitude,
+        'average_rating': row.rating_sum / row.rating_count if row.rating_count else 0.0,
+        'ranking_score': row.ranking_score,
+        'best_for': row.best_for,
+        'also_good_for': also_good_for or [],
+    }
+
+
+async def get_cafe_rows(db: AsyncSession, skip: int = 0, limit: int = 30,
+                        after_id: int | None = None, filters: CafeFilterSchema | None = None,
+                        sort: CafeSort = 'id', after_score: float | None = None,
+                        after_rank: int | None = None) -> List[Dict[str, Any]]:
+    """
+    Cafe page as plain dicts shaped like CafeResponseSchema, built from a column projection.
+    The page of ids is picked first, then only those cafes are joined to their categories.
+
+    ``sort='ranking'`` orders by ranking_score, best first, with id breaking ties; its keyset is
+    (``after_score``, ``after_id``) and is served by idx_cafe_ranking_score. When
+    orders_primary_first, cafes best for the filtered category come first; the keyset is
+    (``after_rank``, ``after_id``) with the rank 0 for those cafes and 1 for the rest.
+    """
+    primary_first = orders_primary_first(filters, sort)
+    if sort == 'ranking':
+        order_by = (CafeModel.ranking_score.desc(), CafeModel.id.desc())
+    elif primary_first:
+        rank = _best_for_rank(filters.best_for)
+        order_by = (rank, CafeModel.id)
+    else:
+        order_by = (CafeModel.id,)
+    try:
+        page = apply_cafe_filters(select(CafeModel.id).order_by(*order_by).limit(limit), filters)
+        if after_id is not None and sort == 'ranking':
+            page = page.where(tuple_(CafeModel.ranking_score, CafeModel.id) < tuple_(after_score, after_id))
+        elif after_id is not None and primary_first:
+            page = page.where(tuple_(rank, CafeModel.id) > tuple_(after_rank, after_id))
+        elif after_id is not None:
+            page = page.where(CafeModel.id > after_id)
+        elif skip:
+            page = page.offset(skip)
+        result = await db.execute(_cafe_rows_statement(page.subquery(), order_by, db.bind.dialect.name))
+        return [_row_to_payload(row) for row in result]
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while fetching cafes') from e
+
+
+async def stream_cafe_rows(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Every cafe as a response-shaped dict plus its raw rating aggregates, read through a server-side
+    cursor ``batch_size`` rows at a time, so memory stays flat regardless of catalog size.
+    """
+    try:
+        stmt = _cafe_rows_statement(dialect=db.bind.dialect.name).execution_options(yield_per=batch_size)
+        result = await db.stream(stmt)
+        async for row in result:
+            yield {**_row_to_payload(row), 'rating_sum': row.rating_sum, 'rating_count': row.rating_count}
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while exporting cafes') from e
+
+
+def _fts_match_expression(query: str) -> str:
+    # Every word becomes a quoted FTS5 string, so user input can never be parsed as query syntax;
+    # the last word is a prefix match to support search-as-you-type
+    tokens = _FTS_TOKEN_RE.findall(query)
+    if not tokens:
+        return ''
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _tsquery_expression(query: str) -> str:
+    # The same for to_tsquery: quoted lexemes joined with &, the last one a :* prefix match
+    tokens = _FTS_TOKEN_RE.findall(query)
+    if not tokens:
+        return ''
+    quoted = [f"'{token}'" for token in tokens]
+    quoted[-1] += ':*'
+    return ' & '.join(quoted)
+
+
+def _search_page(dialect: str, query: str, skip: int, limit: int):
+    """(subquery of matching ids with their rank, order of the ranks) for one page of search results."""
+    if dialect == 'sqlite':
+        match = _fts_match_expression(query)
+        if not match:
+            return None, None
+        title_weight, description_weight = FTS_COLUMN_WEIGHTS
+        page = text(
+            f'SELECT rowid AS id, bm25({CAFE_FTS_TABLE}, :title_weight, :description_weight) AS rank '
+            f'FROM {CAFE_FTS_TABLE} WHERE {CAFE_FTS_TABLE} MATCH :match '
+            f'ORDER BY rank LIMIT :limit OFFSET :skip'
+        ).bindparams(match=match, title_weight=title_weight, description_weight=description_weight,
+                     limit=limit, skip=skip).columns(id=Integer, rank=Float).subquery('page')
+        # bm25: lower is better
+        return page, (func.min(page.c.rank),)
+    if dialect == 'postgresql':
+        match = _tsquery_expression(query)
+        if not match:
+            return None, None
+        # Driven by the idx_cafe_search_vector GIN index, which is built over this very expression
+        page = text(
+            f'SELECT id, ts_rank_cd(CAST(:weights AS real[]), {CAFE_SEARCH_VECTOR_SQL}, query) AS rank '
+            f"FROM cafes, to_tsquery('simple', :match) AS query "
+            f'WHERE ({CAFE_SEARCH_VECTOR_SQL}) @@ query '
+            f'ORDER BY rank DESC, id LIMIT :limit OFFSET :skip'
+        ).bindparams(match=match, weights=TS_RANK_WEIGHTS, limit=limit, skip=skip) \
+            .columns(id=Integer, rank=Float).subquery('page')
+        return page, (func.max(page.c.rank).desc(), CafeModel.id)
+    raise HTTPException(status_code=501, detail=f'Full-text search is not supported on {dialect}')
+
+
+async def search_cafe_rows(db: AsyncSession, query: str, skip: int = 0, limit: int = 30) -> List[Dict[str, Any]]:
+    """
+    Full-text search over title and description, best match first: bm25 over the FTS5 table on SQLite,
+    ts_rank_cd over the tsvector index on PostgreSQL.
+    """
+    dialect = db.bind.dialect.name
+    page, order_by = _search_page(dialect, query, skip, limit)
+    if page is None:
+        return []
+    try:
+        result = await db.execute(_cafe_rows_statement(page, order_by=order_by, dialect=dialect))
+        return [_row_to_payload(row) for row in result]
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while searching cafes') from e
+
+
+async def get_cafe_row_by_id(db: AsyncSession, cafe_id: int) -> Dict[str, Any] | None:
+    """One cafe as a response-shaped dict, in a single statement; None if it does not exist."""
+    try:
+        page = select(CafeModel.id).where(CafeModel.id == cafe_id).subquery()
+        row = (await db.execute(_cafe_rows_statement(page, dialect=db.bind.dialect.name))).first()
+        return _row_to_payload(row) if row else None
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while fetching cafe by ID') from e
+
+
+async def get_cafe_facets(db: AsyncSession, filters: CafeFilterSchema | None = None) -> List[Tuple[str, str, int]]:
+    """
+    (facet, value, cafe count) over the cafes matching ``filters``, for the 'best_for', 'also_good_for'
+    and 'city' facets, computed as one UNION ALL of grouped selects over the filtered ids.
+    """
+    matching = apply_cafe_filters(select(CafeModel.id), filters).cte('matching')
+    category_counts = [
+        select(literal(facet).label('facet'), CategoryModel.name.label('value'), func.count().label('count'))
+        .select_from(CafeCategoryModel)
+        .join(matching, matching.c.id == CafeCategoryModel.cafe_id)
+        .join(CategoryModel, CategoryModel.id == CafeCategoryModel.category_id)
+        .where(CafeCategoryModel.is_best if is_best else not_(CafeCategoryModel.is_best))
+        .group_by(CategoryModel.name)
+        for facet, is_best in (('best_for', True), ('also_good_for', False))
+    ]
+    # Grouped like the city filter matches: spellings of one city count together
+    city_counts = (
+        select(literal('city').label('facet'), func.max(CafeModel.city).label('value'), func.count().label('count'))
+        .join(matching, matching.c.id == CafeModel.id)
+        .group_by(CafeModel.city_normalized)
+    )
+    try:
+        result = await db.execute(union_all(*category_counts, city_counts))
+        return [tuple(row) for row in result]
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while counting cafe facets') from e
+
+
+async def get_cafe_rows_by_ids(db: AsyncSession, cafe_ids: List[int]) -> List[Dict[str, Any]]:
+    """Projection rows for the given cafes, in the order of ``cafe_ids``; missing ids are skipped."""
+    if not cafe_ids:
+        return []
+    try:
+        page = select(CafeModel.id).where(CafeModel.id.in_(cafe_ids)).subquery()
+        result = await db.execute(_cafe_rows_statement(page, dialect=db.bind.dialect.name))
+        rows = {row.id: _row_to_payload(row) for row in result}
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while fetching cafes') from e
+    return [rows[cafe_id] for cafe_id in cafe_ids if cafe_id in rows]
+
+
+async def get_cafe_locations(db: AsyncSession, cells: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (ids, latitudes, longitudes) of the cafes whose geohash starts with any of ``cells``. Each prefix
+    is a range seek on idx_cafe_geohash, so only the cells' cafes are read.
+    """
+    prefix_ranges = [
+        and_(CafeModel.geohash >= cell, CafeModel.geohash < cell + '\U0010ffff') if cell else CafeModel.geohash.is_not(None)
+        for cell in cells
+    ]
     try:
-        db.add(cafe)
-        await db.commit()
-        await db.refresh(cafe)
         result = await db.execute(
-            select(CafeModel).options(
-                selectinload(CafeModel.category_associations).selectinload(CafeCategoryModel.category),
-                selectinload(CafeModel.reviews)
-            ).where(CafeModel.id == cafe.id)
+            select(CafeModel.id, CafeModel.latitude, CafeModel.longitude).where(or_(*prefix_ranges))
         )
-        return result.scalar_one()
+        rows = np.array(result.all(), dtype=np.float64).reshape(-1, 3)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while searching nearby cafes') from e
+    return rows[:, 0].astype(np.int64), rows[:, 1], rows[:, 2]
+
+
+async def get_city_counts(db: AsyncSession) -> List[Tuple[str, str, int]]:
+    """(city, city_normalized, cafe count) for every distinct spelling of every city."""
+    try:
+        result = await db.execute(
+            select(CafeModel.city, CafeModel.city_normalized, func.count())
+            .group_by(CafeModel.city_normalized, CafeModel.city)
+        )
+        return [tuple(row) for row in result]
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while counting cafes per city') from e
+
+
+async def get_cafe_city(db: AsyncSession, cafe_id: int) -> str | None:
+    try:
+        result = await db.execute(select(CafeModel.city).where(CafeModel.id == cafe_id))
+        return result.scalar_one_or_none()
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while fetching cafe by ID') from e
+
+
+async def cafe_exists(db: AsyncSession, cafe_id: int) -> bool:
+    try:
+        result = await db.execute(select(CafeModel.id).where(CafeModel.id == cafe_id))
+        return result.first() is not None
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while fetching cafe by ID') from e
+
+
+async def update_existing_cafe(db: AsyncSession, cafe_id: int, values: Dict[str, Any],
+                               categories: List[Tuple[int, str, bool]] | None = None) -> Dict[str, Any] | None:
+    """
+    Apply ``values`` to the cafe with ``UPDATE ... RETURNING`` and, when ``categories``
+    ((category_id, name, is_best) triples) is given, replace its category associations.
+
+    The response payload is built from the returned columns plus the category state the caller
+    already knows; only when categories are untouched are they read back, in one extra SELECT.
+    Returns None when the cafe does not exist.
+    """
+    # Core UPDATE bypasses the CafeModel @validates hooks
+    if 'city' in values:
+        values = {**values, 'city_normalized': normalize_city(values['city'])}
+    if 'latitude' in values:
+        values = {**values, 'geohash': cafe_geohash(values['latitude'], values['longitude'])}
+    try:
+        if values:
+            stmt = (update(CafeModel).where(CafeModel.id == cafe_id).values(**values)
+                    .returning(*_RESPONSE_COLUMNS).execution_options(synchronize_session=False))
+        else:
+            stmt = select(*_RESPONSE_COLUMNS).where(CafeModel.id == cafe_id)
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            await db.rollback()
+            return None
+        if categories is not None:
+            await db.execute(delete(CafeCategoryModel).where(CafeCategoryModel.cafe_id == cafe_id))
+            if categories:
+                await db.execute(insert(CafeCategoryModel), [
+                    {'cafe_id': cafe_id, 'category_id': category_id, 'is_best': is_best}
+                    for category_id, _, is_best in categories
+                ])
+            category_names = [(name, is_best) for _, name, is_best in categories]
+        else:
+            category_names = await get_cafe_categories(db, cafe_id)
+        if categories is not None or any(column in values for column in CAFE_CONTENT_COLUMNS):
+            bump_table_version(db, *CAFE_CATALOG_TABLES, CAFE_CONTENT_VERSION)
+        else:
+            bump_table_version(db, *CAFE_CATALOG_TABLES)
+        await db.commit()
     except IntegrityError as e:
         await db.rollback()
-        if 'unique constraint' in str(e.orig).lower():
-            raise HTTPException(status_code=409, detail='Cafe with this name and location already exists') from e
+        if is_unique_violation(e):
+            raise HTTPException(status_code=409, detail='Update failed: duplicate name and location') from e
         raise HTTPException(status_code=500, detail='Database integrity error') from e
     except SQLAlchemyError as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail='Database error') from e
+    cafe_response_cache.invalidate(cafe_id)
+    return cafe_payload(row, category_names)
 
 
-async def get_all_cafes(db: AsyncSession, skip: int = 0, limit: int = 30) -> List[CafeModel]:
+async def get_cafe_categories(db: AsyncSession, cafe_id: int) -> List[Tuple[str, bool]]:
     try:
         result = await db.execute(
-            select(CafeModel).options(
-                selectinload(CafeModel.category_associations).selectinload(CafeCategoryModel.category),
-                selectinload(CafeModel.reviews)
-            ).offset(skip).limit(limit)
+            select(CategoryModel.name, CafeCategoryModel.is_best)
+            .join(CategoryModel, CategoryModel.id == CafeCategoryModel.category_id)
+            .where(CafeCategoryModel.cafe_id == cafe_id)
+            .order_by(CafeCategoryModel.id)
         )
-        return result.scalars().all()
+        return [(name, is_best) for name, is_best in result]
     except SQLAlchemyError as e:
-        raise HTTPException(status_code=500, detail='Database error while fetching cafes') from e
+        raise HTTPException(status_code=500, detail='Database error while fetching cafe categories') from e
+
+
+def _dialect_insert(db: AsyncSession):
+    # INSERT ... ON CONFLICT is dialect-specific syntax
+    dialect = db.bind.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        raise HTTPException(status_code=501, detail=f'Cafe upsert is not supported on {dialect}')
+    return dialect_insert
+
 
+async def upsert_cafes(db: AsyncSession, rows: List[Dict[str, Any]], categories: List[List[Tuple[int, bool]]],
+                       update_existing: bool = True) -> List[Tuple[int, bool]]:
+    """
+    Insert many cafes in one transaction, keyed on the (title, city) natural key.
 
-async def get_cafe_by_id(db: AsyncSession, cafe_id: int) -> CafeModel | None:
+    ``rows[i]`` holds the cafe columns (title, city, description, image_url, latitude, longitude) and
+    ``categories[i]`` its (category_id, is_best) pairs. New cafes are written with ``INSERT ... ON
+    CONFLICT DO NOTHING RETURNING``, so concurrent creates of the same cafe cannot race into
+    uq_cafe_title_city. The conflicting rest either gets UPSERT_UPDATED_COLUMNS and categories
+    replaced through ``ON CONFLICT DO UPDATE`` (``update_existing``) or is left untouched and only
+    looked up. Returns (id, created) per row; every statement is a single executemany.
+    """
+    dialect_insert = _dialect_insert(db)
+    keys = [(row['title'], row['city']) for row in rows]
+    conflict_target = [CafeModel.title, CafeModel.city]
+    returning = (CafeModel.id, CafeModel.title, CafeModel.city)
     try:
-        # Добавили eager load
         result = await db.execute(
-            select(CafeModel).options(
-                selectinload(CafeModel.category_associations).selectinload(CafeCategoryModel.category),
-                selectinload(CafeModel.reviews)
-            ).where(CafeModel.id == cafe_id)
+            dialect_insert(CafeModel).on_conflict_do_nothing(index_elements=conflict_target).returning(*returning),
+            rows
         )
-        return result.scalar_one_or_none()
+        created = {(title, city): cafe_id for cafe_id, title, city in result}
+        remaining = [row for key, row in zip(keys, rows) if key not in created]
+        existing: Dict[Tuple[str, str], int] = {}
+        if remaining and update_existing:
+            stmt = dialect_insert(CafeModel)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_target,
+                set_={column: stmt.excluded[column] for column in UPSERT_UPDATED_COLUMNS}
+            ).returning(*returning)
+            existing = {(title, city): cafe_id for cafe_id, title, city in await db.execute(stmt, remaining)}
+            await db.execute(delete(CafeCategoryModel).where(CafeCategoryModel.cafe_id.in_(existing.values())))
+        elif remaining:
+            remaining_keys = [(row['title'], row['city']) for row in remaining]
+            for start in range(0, len(remaining_keys), BULK_LOOKUP_CHUNK_SIZE):
+                result = await db.execute(
+                    select(*returning).where(
+                        tuple_(CafeModel.title, CafeModel.city).in_(remaining_keys[start:start + BULK_LOOKUP_CHUNK_SIZE]))
+                )
+                existing.update({(title, city): cafe_id for cafe_id, title, city in result})
+
+        ids = [created.get(key) or existing[key] for key in keys]
+        associations = [
+            {'cafe_id': cafe_id, 'category_id': category_id, 'is_best': is_best}
+            for cafe_id, key, pairs in zip(ids, keys, categories)
+            if key in created or update_existing
+            for category_id, is_best in pairs
+        ]
+        if associations:
+            await db.execute(insert(CafeCategoryModel), associations)
+        if created or (existing and update_existing):
+            # New cafes, or replaced descriptions and categories
+            bump_table_version(db, *CAFE_CATALOG_TABLES, CAFE_CONTENT_VERSION)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_unique_violation(e):
+            raise HTTPException(status_code=409, detail='Cafe data conflicts with existing data') from e
+        raise HTTPException(status_code=500, detail='Database integrity error while saving cafes') from e
     except SQLAlchemyError as e:
-        raise HTTPException(status_code=500, detail='Database error while fetching cafe by ID') from e
+        await db.rollback()
+        raise HTTPException(status_code=500, detail='Database error while saving cafes') from e
+    for cafe_id in [*created.values(), *(existing.values() if update_existing else ())]:
+        # Created ids too: SQLite may hand out the id of a deleted row again
+        cafe_response_cache.invalidate(cafe_id)
+    return [(cafe_id, key in created) for cafe_id, key in zip(ids, keys)]
 
 
-async def get_cafe_by_title_and_city(db: AsyncSession, title: str, city: str) -> CafeModel | None:
+async def get_rating_arrays(db: AsyncSession) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (ids, rating_sums, rating_counts, ranking_scores) of every cafe as NumPy arrays, in id order.
+    Rows arrive through a server-side cursor RATING_FETCH_CHUNK_SIZE at a time and each chunk is
+    transposed straight into arrays preallocated from a count, so the catalog is never held as a list
+    of row tuples nor copied through a 2-D float array.
+    """
     try:
-        result = await db.execute(
-            select(CafeModel).options(
-                selectinload(CafeModel.category_associations).selectinload(CafeCategoryModel.category),
-                selectinload(CafeModel.reviews)
-            ).where(CafeModel.title == title, CafeModel.city == city)
+        capacity = (await db.execute(select(func.count()).select_from(CafeModel))).scalar_one()
+        arrays = [np.empty(capacity, dtype=dtype) for dtype in (np.int64, np.float64, np.float64, np.float64)]
+        filled = 0
+        result = await db.stream(
+            select(CafeModel.id, CafeModel.rating_sum, CafeModel.rating_count, CafeModel.ranking_score)
+            .order_by(CafeModel.id)
+            .execution_options(yield_per=RATING_FETCH_CHUNK_SIZE)
         )
-        return result.scalar_one_or_none()
+        async for rows in result.partitions():
+            end = filled + len(rows)
+            if end > capacity:
+                # Cafes inserted between the count and the scan (possible outside SQLite's snapshot)
+                capacity = max(end, 2 * capacity)
+                arrays = [np.resize(array, capacity) for array in arrays]
+            for array, column in zip(arrays, zip(*rows)):
+                array[filled:end] = column
+            filled = end
     except SQLAlchemyError as e:
-        raise HTTPException(status_code=500, detail='Database error while fetching cafe by title and city') from e
+        raise HTTPException(status_code=500, detail='Database error while loading cafe ratings') from e
+    ids, sums, counts, scores = (array[:filled] for array in arrays)
+    return ids, sums, counts, scores
 
 
-async def update_existing_cafe(db: AsyncSession, cafe: CafeModel) -> CafeModel:
+async def save_ranking_scores(db: AsyncSession, ids: np.ndarray, scores: np.ndarray) -> None:
+    """Write ranking_score for the given cafes: one executemany UPDATE by primary key per chunk."""
     try:
+        for start in range(0, len(ids), RANKING_UPDATE_CHUNK_SIZE):
+            chunk = slice(start, start + RANKING_UPDATE_CHUNK_SIZE)
+            await db.execute(update(CafeModel), [
+                {'id': cafe_id, 'ranking_score': score}
+                for cafe_id, score in zip(ids[chunk].tolist(), scores[chunk].tolist())
+            ])
+        bump_table_version(db, 'cafes')
         await db.commit()
-        await db.refresh(cafe)
-        result = await db.execute(
-            select(CafeModel).options(
-                selectinload(CafeModel.category_associations).selectinload(CafeCategoryModel.category),
-                selectinload(CafeModel.reviews)
-            ).where(CafeModel.id == cafe.id)
-        )
-        return result.scalar_one()
-    except IntegrityError as e:
-        await db.rollback()
-        if 'unique constraint' in str(e.orig).lower():
-            raise HTTPException(status_code=409, detail='Update failed: duplicate name and location') from e
-        raise HTTPException(status_code=500, detail='Database integrity error') from e
     except SQLAlchemyError as e:
         await db.rollback()
-        raise HTTPException(status_code=500, detail='Database error') from e
+        raise HTTPException(status_code=500, detail='Database error while saving ranking scores') from e
+    # ranking_score is part of the cached cafe responses; unchanged cafes keep theirs
+    for cafe_id in ids.tolist():
+        cafe_response_cache.invalidate(cafe_id)
@@ -4,6 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.app_core.domain.models.category_model import CategoryModel
 from sqlalchemy.future import select
+from sqlalchemy.orm import raiseload
+from app.infrastructure.etag import bump_table_version
+from app.infrastructure.db_errors import is_unique_violation
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,13 +15,16 @@ logger = logging.getLogger(__name__)
 async def add_category(db: AsyncSession, category: CategoryModel) -> CategoryModel:
     try:
         db.add(category)
+        bump_table_version(db, 'categories')
         await db.commit()
         await db.refresh(category)
         return category
     except IntegrityError as e:
         await db.rollback()
         logger.error(f"Integrity error adding category '{category.name}': {str(e)}")
-        raise HTTPException(status_code=409, detail='Category with this name already exists') from e
+        if is_unique_violation(e):
+            raise HTTPException(status_code=409, detail='Category with this name already exists') from e
+        raise HTTPException(status_code=500, detail='Database integrity error') from e
     except SQLAlchemyError as e:
         await db.rollback()
         logger.error(f'DB error adding category: {str(e)}')
@@ -27,17 +33,9 @@ async def add_category(db: AsyncSession, category: CategoryModel) -> CategoryMod
 
 async def get_all_categories(db: AsyncSession) -> List[CategoryModel]:
     try:
-        result = await db.execute(select(CategoryModel))
+        # Callers read id and name only; cafe_associations is never loaded
+        result = await db.execute(select(CategoryModel).options(raiseload('*')))
         return result.scalars().all()
     except SQLAlchemyError as e:
         logger.error(f'DB error fetching all categories: {str(e)}')
         raise HTTPException(status_code=500, detail='Database error') from e
-
-
-async def get_category_by_name(db: AsyncSession, name: str) -> CategoryModel | None:
-    try:
-        result = await db.execute(select(CategoryModel).where(CategoryModel.name == name))
-        return result.scalar_one_or_none()
-    except SQLAlchemyError as e:
-        logger.error(f"DB error fetching category by name '{name}': {str(e)}")
-        raise HTTPException(status_code=500, detail='Database error') from e
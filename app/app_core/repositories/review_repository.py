@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.future import select
+from app.app_core.domain.models.review_model import ReviewModel
+from app.app_core.domain.models.user_model import UserModel
+from app.app_core.repositories.cafe_repository import cafe_response_cache
+from app.infrastructure.etag import bump_table_version
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def add_review(db: AsyncSession, review: ReviewModel) -> ReviewModel:
+    """
+    Insert the review; the ReviewModel after_insert hook adjusts the cafe's rating_sum/rating_count
+    in the same flush, so the review and the aggregate commit or roll back together.
+    """
+    try:
+        db.add(review)
+        bump_table_version(db, 'reviews')
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f'DB error adding review for cafe {review.cafe_id}: {str(e)}')
+        raise HTTPException(status_code=500, detail='Database error') from e
+    # average_rating is part of the cached cafe response
+    cafe_response_cache.invalidate(review.cafe_id)
+    return review
+
+
+async def get_cafe_reviews(db: AsyncSession, cafe_id: int, limit: int = 20,
+                           after: Tuple[datetime, int] | None = None) -> List[Dict[str, Any]]:
+    """
+    Newest-first page of a cafe's reviews with the author's username.
+    Keyset pagination on (created_at, id): ``after`` is the key of the last review of the previous page.
+    """
+    stmt = (
+        select(ReviewModel.id, ReviewModel.rating, ReviewModel.comment, ReviewModel.created_at,
+               UserModel.username.label('user_name'))
+        .join(UserModel, UserModel.id == ReviewModel.user_id)
+        .where(ReviewModel.cafe_id == cafe_id)
+        .order_by(ReviewModel.created_at.desc(), ReviewModel.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(ReviewModel.created_at, ReviewModel.id) < tuple_(*after))
+    try:
+        result = await db.execute(stmt)
+        return [dict(row._mapping) for row in result]
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail='Database error while fetching reviews') from e
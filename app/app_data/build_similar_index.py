@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+
+from app.app_configs import Configs
+from app.infrastructure.database import AsyncSessionLocal, async_engine
+from app.app_core.domain.services.similarity_index import similarity_index
+
+
+async def build(output: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await similarity_index.rebuild(db)
+    similarity_index.save(output)
+    print(f'Similar-cafes index for {len(similarity_index.ids)} cafes written to {output}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the similar-cafes index loaded by the app at startup.')
+    parser.add_argument('-o', '--output', default=Configs.SIMILAR_INDEX_PATH,
+                        help=f'index file (default: {Configs.SIMILAR_INDEX_PATH})')
+    args = parser.parse_args()
+    async_engine.echo = False
+    asyncio.run(build(args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import asyncio
+import sys
+
+from app.infrastructure.database import AsyncReadSessionLocal, async_engine
+from app.app_core.domain.services import cafe_service
+
+
+async def export_catalog(output: str, compress: bool) -> None:
+    out = sys.stdout.buffer if output == '-' else open(output, 'wb')
+    try:
+        async with AsyncReadSessionLocal() as db:
+            async for chunk in cafe_service.export_cafes_ndjson(db, compress=compress):
+                out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream every cafe as NDJSON (one cafe per line).')
+    parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--gzip', action='store_true', help='gzip-compress the output')
+    args = parser.parse_args()
+    # SQL echo is written to stdout, which may be carrying the export itself
+    async_engine.echo = False
+    asyncio.run(export_catalog(args.output, args.gzip))
+
+
+if __name__ == "__main__":
+    main()
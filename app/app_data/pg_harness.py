@@ -0,0 +1,156 @@
+"""
+Run the app's database code against a throwaway local PostgreSQL.
+
+A scratch cluster is created with ``initdb`` in a temporary directory, started on a free port,
+migrated with ``alembic upgrade head`` and removed again on exit. By default a set of checks is
+run against the PostgreSQL-specific code paths (asyncpg errors, ON CONFLICT upserts, JSON category
+aggregation, tsvector search); anything after ``--`` is run instead, with SQLALCHEMY_DATABASE_URL
+pointing at the cluster:
+
+    python -m app.app_data.pg_harness
+    python -m app.app_data.pg_harness -- uvicorn app.main:app
+
+The PostgreSQL server binaries must be on PATH (or in $PG_BIN); initdb refuses to run as root.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from typing import Iterator, List
+
+
+def _pg_tool(name: str) -> str:
+    path = os.path.join(os.environ['PG_BIN'], name) if os.getenv('PG_BIN') else shutil.which(name)
+    if not path or not os.path.exists(path):
+        raise SystemExit(f'{name} not found: put the PostgreSQL server binaries on PATH or set PG_BIN')
+    return path
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def throwaway_postgres() -> Iterator[str]:
+    """Yield the asyncpg URL of a freshly initialized cluster that is stopped and deleted afterwards."""
+    initdb, pg_ctl = _pg_tool('initdb'), _pg_tool('pg_ctl')
+    data_dir = tempfile.mkdtemp(prefix='cafes-pg-')
+    port = _free_port()
+    try:
+        subprocess.run([initdb, '-D', data_dir, '-U', 'postgres', '--auth=trust', '--encoding=UTF8', '--no-sync'],
+                       check=True, stdout=subprocess.DEVNULL)
+        # Durability is pointless for a cluster that is deleted on exit
+        server_options = f'-p {port} -k {data_dir} -c listen_addresses=127.0.0.1 -c fsync=off -c full_page_writes=off'
+        subprocess.run([pg_ctl, '-D', data_dir, '-l', os.path.join(data_dir, 'server.log'), '-o', server_options,
+                        '-w', 'start'], check=True, stdout=subprocess.DEVNULL)
+        try:
+            yield f'postgresql+asyncpg://postgres@127.0.0.1:{port}/postgres'
+        finally:
+            subprocess.run([pg_ctl, '-D', data_dir, '-m', 'immediate', '-w', 'stop'], stdout=subprocess.DEVNULL)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+async def _expect_status(status_code: int, awaitable) -> None:
+    from fastapi import HTTPException
+    try:
+        await awaitable
+    except HTTPException as e:
+        assert e.status_code == status_code, f'expected {status_code}, got {e.status_code}: {e.detail}'
+        return
+    raise AssertionError(f'expected HTTP {status_code}, got success')
+
+
+async def run_checks() -> None:
+    # Imported here: the engine is created from SQLALCHEMY_DATABASE_URL at import time
+    from sqlalchemy import text
+    from app.app_core.domain.models.cafe_search_index import CAFE_SEARCH_INDEX, CAFE_SEARCH_VECTOR_SQL
+    from app.app_core.domain.models.category_model import CategoryModel
+    from app.app_core.domain.schemas.cafe_schemas import CafeCreateSchema, CafeFilterSchema, CafeUpdateSchema
+    from app.app_core.domain.services import cafe_service
+    from app.app_core.repositories import category_repository
+    from app.infrastructure.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        assert db.bind.dialect.driver == 'asyncpg', db.bind.dialect.driver
+        collations = dict((await db.execute(text(
+            "SELECT column_name, collation_name FROM information_schema.columns "
+            "WHERE table_name = 'cafes' AND column_name IN ('city_normalized', 'geohash')"))).all())
+        assert collations == {'city_normalized': 'C', 'geohash': 'C'}, collations
+        print('ok: prefix-filtered columns use the C collation')
+
+        for name in ('Coffee', 'Work', 'Dates'):
+            await category_repository.add_category(db, CategoryModel(name=name))
+        await _expect_status(409, category_repository.add_category(db, CategoryModel(name='Coffee')))
+        print('ok: duplicate category is a 409')
+
+        first = await cafe_service.create_cafe(db, CafeCreateSchema(
+            title='Harness', city='Москва', description='First', best_for='Coffee', also_good_for=['Work', 'Dates'],
+            latitude=55.7558, longitude=37.6173))
+        second = await cafe_service.create_cafe(db, CafeCreateSchema(
+            title='Harness', city='Казань', description='Second', best_for='Work'))
+        again = await cafe_service.create_cafe(db, CafeCreateSchema(
+            title='Harness', city='Москва', description='Again', best_for='Work'))
+        assert again.id == first.id and again.best_for == 'Coffee', again
+        print('ok: ON CONFLICT upsert returns the existing cafe')
+
+        rows = await cafe_service.get_cafe_rows(db, filters=CafeFilterSchema(city='моск'))
+        assert [row['id'] for row in rows] == [first.id], rows
+        assert rows[0]['also_good_for'] == ['Work', 'Dates'], rows[0]['also_good_for']
+        rows = await cafe_service.get_cafe_rows(db)
+        assert {row['id']: row['also_good_for'] for row in rows} == {first.id: ['Work', 'Dates'], second.id: []}, rows
+        print('ok: list query aggregates categories into JSON arrays')
+
+        await _expect_status(409, cafe_service.update_cafe(db, second.id, CafeUpdateSchema(city='Москва')))
+        print('ok: update onto an existing (title, city) is a 409')
+
+        nearby = await cafe_service.get_nearby_cafes(db, 55.75, 37.62, 2000, 10)
+        assert [cafe.id for cafe in nearby] == [first.id], nearby
+        print('ok: nearby search')
+
+        found = await cafe_service.search_cafes(db, 'harn')
+        assert [row['id'] for row in found] == [first.id, second.id], found
+        await db.execute(text('SET LOCAL enable_seqscan = off'))
+        plan = '\n'.join((await db.execute(text(
+            "EXPLAIN SELECT id FROM cafes WHERE (" + CAFE_SEARCH_VECTOR_SQL + ") @@ to_tsquery('simple', 'harn:*')"
+        ))).scalars())
+        await db.rollback()
+        assert CAFE_SEARCH_INDEX in plan, plan
+        print('ok: full-text search uses the tsvector GIN index')
+
+
+def _run(argv: List[str], url: str) -> int:
+    env = {**os.environ, 'SQLALCHEMY_DATABASE_URL': url}
+    env.pop('SQLALCHEMY_READ_DATABASE_URL', None)
+    subprocess.run([sys.executable, '-m', 'alembic', 'upgrade', 'head'], check=True, env=env)
+    return subprocess.run(argv, env=env).returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate a throwaway local PostgreSQL and run checks or a command on it.')
+    parser.add_argument('--checks', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('command', nargs=argparse.REMAINDER,
+                        help="command to run instead of the checks, after '--' (default: the checks)")
+    args = parser.parse_args()
+    if args.checks:
+        from app.infrastructure.database import async_engine
+        async_engine.echo = False
+        asyncio.run(run_checks())
+        return
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+    command = command or [sys.executable, '-m', 'app.app_data.pg_harness', '--checks']
+    with throwaway_postgres() as url:
+        print(f'PostgreSQL at {url}', file=sys.stderr)
+        returncode = _run(command, url)
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+
+from app.app_configs import Configs
+from app.infrastructure.database import AsyncSessionLocal, async_engine
+from app.app_core.domain.services import ranking_service
+
+
+async def recompute(method: str, tolerance: float) -> None:
+    async with AsyncSessionLocal() as db:
+        updated = await ranking_service.recompute_rankings(db, method, tolerance)
+    print(f'{updated} cafes re-ranked')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute cafes.ranking_score for the whole catalog.')
+    parser.add_argument('--method', choices=['bayesian', 'wilson'], default=Configs.RANKING_METHOD,
+                        help=f'scoring method (default: {Configs.RANKING_METHOD})')
+    parser.add_argument('--tolerance', type=float, default=Configs.RANKING_SCORE_TOLERANCE,
+                        help='only rewrite scores that moved by more than this (0: rewrite every changed score)')
+    args = parser.parse_args()
+    # Writes are batched executemany calls; echoing every parameter set would dominate the runtime
+    async_engine.echo = False
+    asyncio.run(recompute(args.method, args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
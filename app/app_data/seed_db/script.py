@@ -1,7 +1,8 @@
 import asyncio
-from sqlalchemy import select, func
-from sqlalchemy.exc import IntegrityError
-from app.app_core.domain.models import CafeModel, CategoryModel, CafeCategoryModel
+from collections import Counter
+from fastapi import HTTPException
+from app.app_core.domain.schemas.category_schemas import CategoryCreateSchema
+from app.app_core.domain.services import cafe_service, category_service
 from app.app_data.data import categories_data, cafes_data
 from app.infrastructure.database import AsyncSessionLocal
 
@@ -9,154 +10,27 @@ from app.infrastructure.database import AsyncSessionLocal
 async def seed_database():
     async with AsyncSessionLocal() as db:
         try:
-            # Проверяем категории
-            result = await db.execute(select(CategoryModel))
-            existing_categories = {c.name: c for c in result.scalars().all()}
-
+            # Категории: существующие пропускаются, новые попадают в реестр и двигают версию таблицы
             for cat_data in categories_data:
-                if cat_data['name'] not in existing_categories:
-                    category = CategoryModel(name=cat_data['name'])
-                    db.add(category)
-            await db.commit()
-
-            # Получаем актуальный словарь категорий
-            result = await db.execute(select(CategoryModel))
-            categories = {c.name: c.id for c in result.scalars().all()}
-
-            # Проверяем, что все категории из cafes_data есть в categories
-            all_cafe_categories = set()
-            for cafe in cafes_data:
-                all_cafe_categories.add(cafe['best_for'])
-                all_cafe_categories.update(cafe['also_good_for'])
-            missing = all_cafe_categories - set(categories.keys())
-            if missing:
-                print(f"Warning: Missing categories in categories_data: {missing}")
-
-            # Проверяем текущее количество ассоциаций
-            result = await db.execute(select(func.count()).select_from(CafeCategoryModel))
-            current_assoc_count = result.scalar()
-            print(f"Current category associations in database: {current_assoc_count}")
-
-            new_cafe_count = 0
-            updated_cafe_count = 0
-            assoc_added_count = 0
-            assoc_updated_count = 0
-            assoc_removed_count = 0
-
-            for cafe_data in cafes_data:
-                # Валидация длины строк
-                if len(cafe_data['title']) > 255:
-                    print(f"Error: Title too long for {cafe_data['title']}")
-                    continue
-                if len(cafe_data['city']) > 100:
-                    print(f"Error: City too long for {cafe_data['title']}")
-                    continue
-                if cafe_data['image_url'] and len(cafe_data['image_url']) > 500:
-                    print(f"Error: image_url too long for {cafe_data['title']}")
-                    continue
-
-                # Проверяем валидность категорий
-                if cafe_data['best_for'] not in categories:
-                    print(f"Invalid best_for category {cafe_data['best_for']} for {cafe_data['title']}")
-                    continue
-                invalid_cats = [cat for cat in cafe_data['also_good_for'] if cat not in categories]
-                if invalid_cats:
-                    print(f"Invalid also_good_for categories {invalid_cats} for {cafe_data['title']}")
-                    continue
-
-                # Проверка на дубликат: best_for не должно быть в also_good_for
-                if cafe_data['best_for'] in cafe_data['also_good_for']:
-                    print(
-                        f"Error: Category {cafe_data['best_for']} is duplicated in best_for and also_good_for for {cafe_data['title']}")
-                    continue
-
-                # Уникальный набор категорий для кафе
-                unique_categories = {cafe_data['best_for']} | set(cafe_data['also_good_for'])
-                desired_category_ids = {categories[cat_name] for cat_name in unique_categories}
-                best_for_id = categories[cafe_data['best_for']]
-
-                # Проверяем, существует ли кафе
-                result = await db.execute(
-                    select(CafeModel).filter_by(title=cafe_data['title'], city=cafe_data['city'])
-                )
-                existing_cafe = result.scalars().first()
-
-                if existing_cafe:
-                    # Обновляем существующие поля
-                    updated = False
-                    if existing_cafe.description != cafe_data['description']:
-                        existing_cafe.description = cafe_data['description']
-                        updated = True
-                    if existing_cafe.image_url != cafe_data['image_url']:
-                        existing_cafe.image_url = cafe_data['image_url']
-                        updated = True
-                    if updated:
-                        updated_cafe_count += 1
-
-                    # Получаем текущие ассоциации для кафе
-                    result = await db.execute(
-                        select(CafeCategoryModel).filter_by(cafe_id=existing_cafe.id)
-                    )
-                    existing_assocs = {assoc.category_id: assoc for assoc in result.scalars().all()}
-                    current_assoc_ids = set(existing_assocs.keys())
-
-                    # Определяем, что нужно добавить, обновить или удалить
-                    for cat_id in desired_category_ids:
-                        is_best = (cat_id == best_for_id)
-                        if cat_id in existing_assocs:
-                            # Обновляем существующую ассоциацию, если изменился is_best
-                            assoc = existing_assocs[cat_id]
-                            if assoc.is_best != is_best:
-                                assoc.is_best = is_best
-                                assoc_updated_count += 1
-                        else:
-                            # Добавляем новую ассоциацию
-                            assoc = CafeCategoryModel(
-                                cafe_id=existing_cafe.id,
-                                category_id=cat_id,
-                                is_best=is_best,
-                            )
-                            db.add(assoc)
-                            assoc_added_count += 1
-
-                    # Удаляем ассоциации, которых больше нет в desired_category_ids
-                    for cat_id in current_assoc_ids - desired_category_ids:
-                        db.delete(existing_assocs[cat_id])
-                        assoc_removed_count += 1
-                else:
-                    # Добавляем новое кафе
-                    cafe = CafeModel(
-                        title=cafe_data['title'],
-                        city=cafe_data['city'],
-                        description=cafe_data['description'],
-                        image_url=cafe_data['image_url'],
-                    )
-                    db.add(cafe)
-                    await db.flush()  # Нужен для получения cafe.id
-                    for cat_name in unique_categories:
-                        assoc = CafeCategoryModel(
-                            cafe_id=cafe.id,
-                            category_id=categories[cat_name],
-                            is_best=(cat_name == cafe_data['best_for']),
-                        )
-                        db.add(assoc)
-                        assoc_added_count += 1
-                    new_cafe_count += 1
-
-                print(
-                    f"Processed {cafe_data['title']} in {cafe_data['city']}, categories: best_for={cafe_data['best_for']}, also_good_for={cafe_data['also_good_for']}")
+                await category_service.create_category(db, CategoryCreateSchema(**cat_data))
 
-            print(f"Total new cafes added: {new_cafe_count}")
-            print(f"Total cafes updated: {updated_cafe_count}")
-            print(f"Total category associations added: {assoc_added_count}")
-            print(f"Total category associations updated: {assoc_updated_count}")
-            print(f"Total category associations removed: {assoc_removed_count}")
-            await db.flush()
-            await db.commit()
-            print('Database seeded successfully!')
-        except IntegrityError as e:
+            # Кафе: один upsert по (title, city), как у POST /cafes/bulk — описание, картинка и категории
+            # существующих кафе обновляются, кеши и версии таблиц инвалидируются
+            results = await cafe_service.bulk_save_cafes(db, cafes_data)
+        except HTTPException as e:
             await db.rollback()
-            print(f"Error: Database conflict occurred - {e}")
+            print(f"Error: {e.detail}")
+            return
+
+    for result in results:
+        if result.status == 'invalid':
+            cafe_data = cafes_data[result.index]
+            print(f"Error: {cafe_data.get('title')} in {cafe_data.get('city')}: {'; '.join(result.errors)}")
+    counts = Counter(result.status for result in results)
+    print(f"Total new cafes added: {counts['created']}")
+    print(f"Total cafes updated: {counts['updated']}")
+    print(f"Total cafes rejected: {counts['invalid']}")
+    print('Database seeded successfully!')
 
 
 async def main():
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.database import AsyncReadSessionLocal, AsyncSessionLocal
 
 
 async def get_db() -> AsyncSession:
@@ -7,6 +7,12 @@ async def get_db() -> AsyncSession:
         yield db
 
 
+async def get_read_db() -> AsyncSession:
+    # For handlers that only read: bound to the read replica / read-only pool
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
 """
 
 
@@ -1,7 +1,8 @@
 # –––––––––––––––––– IMPORTS –––––––––––––––––– #
 
 from fastapi import APIRouter
-from app.app_routers import auth_router, users_router, cafes_router, categories_router
+from app.app_routers import auth_router, users_router, cafes_router, categories_router, reviews_router, \
+    cities_router, system_router, metrics_router
 
 # ––––––––––––––––––––––––– ROUTER ––––––––––––––––––––––––– #
 
@@ -9,7 +10,11 @@ router = APIRouter()
 router.include_router(auth_router.router)
 router.include_router(users_router.router)
 router.include_router(cafes_router.router)
+router.include_router(reviews_router.router)
 router.include_router(categories_router.router)
+router.include_router(cities_router.router)
+router.include_router(system_router.router)
+router.include_router(metrics_router.router)
 
 
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––– #
@@ -1,50 +1,162 @@
 # –––––––––––––––––– IMPORTS –––––––––––––––––– #
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from app.app_core.domain.models.cafe_model import CafeModel
-from app.app_core.domain.schemas.cafe_schemas import CafeCreateSchema, CafeResponseSchema, CafeUpdateSchema
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.app_core.domain.schemas.cafe_schemas import (
+    CafeBulkItemResultSchema, CafeCreateSchema, CafeFacetsSchema, CafeFilterSchema, CafeResponseSchema, CafeSort,
+    CafeUpdateSchema, NearbyCafeSchema, SimilarCafeSchema)
 from app.app_core.domain.models.user_model import UserModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.app_dependencies.dependencies import get_db
+from app.app_dependencies.dependencies import get_db, get_read_db
+from app.infrastructure.database import AsyncReadSessionLocal
 from app.app_core.domain.services import cafe_service
 from app.infrastructure.auth_backend import current_superuser
-from typing import List
+from app.app_configs import Configs
+from app.infrastructure.etag import check_etag
+from app.app_core.repositories.cafe_repository import CAFE_CATALOG_TABLES, orders_primary_first
+from app.app_core.domain.services.similarity_index import SIMILAR_CAFES_TABLE
+from app.infrastructure.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from typing import Any, Dict, List, Literal, Optional
 
 # –––––––––––––––––– ROUTER –––––––––––––––––– #
 
 router = APIRouter(prefix='/cafes', tags=['cafes'])
 
 
+# –––––––––––––––––– DEPENDENCIES –––––––––––––––––– #
+
+def cafe_filters(
+        city: Optional[str] = Query(None, max_length=100, description='Case- and accent-insensitive city name'),
+        city_match: Literal['prefix', 'contains'] = Query('prefix'),
+        best_for: Optional[str] = Query(None, max_length=50),
+        best_for_match: Literal['primary', 'any'] = Query(
+            'primary', description="'any': also cafes only also good for best_for, after those best for it"),
+        also_good_for: List[str] = Query([], description='Matches cafes also good for any of these')
+) -> CafeFilterSchema:
+    return CafeFilterSchema(city=city, city_match=city_match, best_for=best_for, best_for_match=best_for_match,
+                            also_good_for=also_good_for)
+
+
 # –––––––––––––––––– ROUTES –––––––––––––––––– #
 
 @router.post('', response_model=CafeResponseSchema)
 @router.post('/', include_in_schema=False)
 async def create_new_cafe(cafe_data: CafeCreateSchema, db: AsyncSession = Depends(get_db),
                           _user: UserModel = Depends(current_superuser)):
-    cafe: CafeModel = await cafe_service.create_cafe(db, cafe_data)
-    return CafeResponseSchema.from_orm(cafe)
+    return await cafe_service.create_cafe(db, cafe_data)
+
+
+@router.post('/bulk', response_model=List[CafeBulkItemResultSchema])
+async def bulk_save_cafes(items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=Configs.CAFE_BULK_MAX_ITEMS,
+                                                             description='CafeCreateSchema objects'),
+                          db: AsyncSession = Depends(get_db), _user: UserModel = Depends(current_superuser)):
+    # Items are validated one by one in the service so a bad row is reported instead of failing the batch
+    return await cafe_service.bulk_save_cafes(db, items)
 
 
 @router.get('', response_model=List[CafeResponseSchema])
 @router.get('/', include_in_schema=False)
-async def read_all_cafes(db: AsyncSession = Depends(get_db), skip: int = Query(0, ge=0)):
+async def read_all_cafes(request: Request, response: Response, db: AsyncSession = Depends(get_read_db), skip: int = Query(0, ge=0),
+                         cursor: Optional[str] = Query(None, description=f'Opaque token from the {NEXT_CURSOR_HEADER} header'),
+                         filters: CafeFilterSchema = Depends(cafe_filters),
+                         sort: CafeSort = Query('id', description="'ranking': best ranking_score first")):
+    if not_modified := check_etag(request, response, *CAFE_CATALOG_TABLES):
+        return not_modified
     limit: int = 30
-    cafes: List[CafeModel] = await cafe_service.get_all_cafes(db, skip, limit)
-    return [CafeResponseSchema.from_orm(cafe) for cafe in cafes]
+    after_id: int | None = None
+    after_score: float | None = None
+    after_rank: int | None = None
+    primary_first = orders_primary_first(filters, sort)
+    if cursor and sort == 'ranking':
+        after_score, after_id = decode_cursor(cursor, size=2)
+        if not isinstance(after_score, (int, float)) or not isinstance(after_id, int):
+            raise HTTPException(status_code=400, detail='Invalid pagination cursor')
+    elif cursor and primary_first:
+        after_rank, after_id = decode_cursor(cursor, size=2)
+        if after_rank not in (0, 1) or not isinstance(after_id, int):
+            raise HTTPException(status_code=400, detail='Invalid pagination cursor')
+    elif cursor:
+        (after_id,) = decode_cursor(cursor)
+        if not isinstance(after_id, int):
+            raise HTTPException(status_code=400, detail='Invalid pagination cursor')
+    cafes: List[dict] = await cafe_service.get_cafe_rows(db, skip, limit, after_id, filters, sort, after_score,
+                                                         after_rank)
+    if len(cafes) == limit and sort == 'ranking':
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(cafes[-1]['ranking_score'], cafes[-1]['id'])
+    elif len(cafes) == limit and primary_first:
+        rank = 0 if cafes[-1]['best_for'] == filters.best_for else 1
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rank, cafes[-1]['id'])
+    elif len(cafes) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(cafes[-1]['id'])
+    return [CafeResponseSchema.model_validate(cafe) for cafe in cafes]
+
+
+@router.get('/search', response_model=List[CafeResponseSchema])
+async def search_cafes(request: Request, response: Response, q: str = Query(..., min_length=1, max_length=200),
+                       skip: int = Query(0, ge=0), db: AsyncSession = Depends(get_read_db)):
+    if not_modified := check_etag(request, response, *CAFE_CATALOG_TABLES):
+        return not_modified
+    limit: int = 30
+    cafes: List[dict] = await cafe_service.search_cafes(db, q, skip, limit)
+    return [CafeResponseSchema.model_validate(cafe) for cafe in cafes]
+
+
+@router.get('/facets', response_model=CafeFacetsSchema)
+async def read_cafe_facets(request: Request, response: Response, db: AsyncSession = Depends(get_read_db),
+                           filters: CafeFilterSchema = Depends(cafe_filters)):
+    if not_modified := check_etag(request, response, *CAFE_CATALOG_TABLES):
+        return not_modified
+    return await cafe_service.get_cafe_facets(db, filters)
+
+
+@router.get('/nearby', response_model=List[NearbyCafeSchema])
+async def read_nearby_cafes(request: Request, response: Response,
+                            lat: float = Query(..., ge=-90, le=90), lon: float = Query(..., ge=-180, le=180),
+                            radius: float = Query(1000, gt=0, le=Configs.NEARBY_MAX_RADIUS_M, description='Meters'),
+                            limit: int = Query(30, ge=1, le=100), db: AsyncSession = Depends(get_read_db)):
+    if not_modified := check_etag(request, response, *CAFE_CATALOG_TABLES):
+        return not_modified
+    return await cafe_service.get_nearby_cafes(db, lat, lon, radius, limit)
+
+
+@router.get('/export', response_class=StreamingResponse)
+async def export_cafes(gzip: bool = Query(False), _user: UserModel = Depends(current_superuser)):
+    async def body():
+        # Own session: yield-dependencies are torn down before a streaming body is sent
+        async with AsyncReadSessionLocal() as db:
+            async for chunk in cafe_service.export_cafes_ndjson(db, compress=gzip):
+                yield chunk
+
+    filename = 'cafes.ndjson.gz' if gzip else 'cafes.ndjson'
+    return StreamingResponse(body(), media_type='application/gzip' if gzip else 'application/x-ndjson',
+                             headers={'Content-Disposition': f'attachment; filename="{filename}"'})
 
 
 @router.put('/{cafe_id}', response_model=CafeResponseSchema)
 async def update_existing_cafe(cafe_id: int, cafe_data: CafeUpdateSchema, db: AsyncSession = Depends(get_db),
                                _user: UserModel = Depends(current_superuser)):
-    updated_cafe: CafeModel | None = await cafe_service.update_cafe(db, cafe_id, cafe_data)
+    updated_cafe: CafeResponseSchema | None = await cafe_service.update_cafe(db, cafe_id, cafe_data)
     if not updated_cafe:
         raise HTTPException(status_code=404, detail='Cafe not found')
-    return CafeResponseSchema.from_orm(updated_cafe)
+    return updated_cafe
 
 
 @router.get('/{cafe_id}', response_model=CafeResponseSchema)
-async def read_cafe(cafe_id: int, db: AsyncSession = Depends(get_db)):
-    cafe: CafeModel | None = await cafe_service.get_cafe(db, cafe_id)
-    if not cafe:
+async def read_cafe(cafe_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    if not_modified := check_etag(request, response, *CAFE_CATALOG_TABLES):
+        return not_modified
+    payload: bytes | None = await cafe_service.get_cafe_payload(db, cafe_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail='Cafe not found')
-    return CafeResponseSchema.from_orm(cafe)
+    # Already serialized (and possibly cached): skip response_model validation and re-encoding
+    return Response(content=payload, media_type='application/json',
+                    headers={name: response.headers[name] for name in ('ETag', 'Cache-Control')})
+
+
+@router.get('/{cafe_id}/similar', response_model=List[SimilarCafeSchema])
+async def read_similar_cafes(cafe_id: int, request: Request, response: Response,
+                             db: AsyncSession = Depends(get_read_db),
+                             limit: int = Query(10, ge=1, le=Configs.SIMILAR_CAFES_K)):
+    if not_modified := check_etag(request, response, SIMILAR_CAFES_TABLE, *CAFE_CATALOG_TABLES):
+        return not_modified
+    return await cafe_service.get_similar_cafes(db, cafe_id, limit)
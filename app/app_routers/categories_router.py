@@ -1,11 +1,11 @@
 # –––––––––––––––––– IMPORTS –––––––––––––––––– #
 
-from fastapi import APIRouter, Depends
-from app.app_core.domain.models.category_model import CategoryModel
+from fastapi import APIRouter, Depends, Request, Response
 from app.app_core.domain.schemas.category_schemas import CategoryResponseSchema
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.app_dependencies.dependencies import get_db
+from app.app_dependencies.dependencies import get_read_db
 from app.app_core.domain.services import category_service
+from app.infrastructure.etag import check_etag
 from typing import List
 
 
@@ -18,6 +18,8 @@ router = APIRouter(prefix='/categories', tags=['categories'])
 
 @router.get('', response_model=List[CategoryResponseSchema])
 @router.get('/', include_in_schema=False)
-async def get_categories(db: AsyncSession = Depends(get_db)):
-    categories: List[CategoryModel] = await category_service.get_categories(db)
-    return [CategoryResponseSchema.from_orm(cat) for cat in categories]
+async def get_categories(request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    if not_modified := check_etag(request, response, 'categories'):
+        return not_modified
+    # Served from the in-memory category registry; the session is only used if it needs (re)loading
+    return await category_service.get_categories(db)
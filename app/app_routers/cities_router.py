@@ -0,0 +1,23 @@
+# –––––––––––––––––– IMPORTS –––––––––––––––––– #
+
+from fastapi import APIRouter, Depends, Query
+from app.app_core.domain.schemas.city_schemas import CitySuggestionSchema
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.app_dependencies.dependencies import get_read_db
+from app.app_core.domain.services.city_index import city_index
+from typing import List
+
+# –––––––––––––––––– ROUTER –––––––––––––––––– #
+
+router = APIRouter(prefix='/cities', tags=['cities'])
+
+
+# –––––––––––––––––– ROUTES –––––––––––––––––– #
+
+@router.get('/suggest', response_model=List[CitySuggestionSchema])
+async def suggest_cities(prefix: str = Query(..., min_length=1, max_length=100,
+                                             description='Case- and accent-insensitive start of a city name'),
+                         limit: int = Query(10, ge=1, le=50), db: AsyncSession = Depends(get_read_db)):
+    # Served from the in-memory city index; the session is only used if it needs (re)loading
+    await city_index.ensure_loaded(db)
+    return [CitySuggestionSchema(name=name, cafe_count=count) for name, count in city_index.suggest(prefix, limit)]
@@ -0,0 +1,17 @@
+# –––––––––––––––––– IMPORTS –––––––––––––––––– #
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.infrastructure.metrics import PROMETHEUS_CONTENT_TYPE, registry
+
+# –––––––––––––––––– ROUTER –––––––––––––––––– #
+
+router = APIRouter(tags=['system'])
+
+
+# –––––––––––––––––– ROUTES –––––––––––––––––– #
+
+@router.get('/metrics', response_class=PlainTextResponse)
+async def get_metrics():
+    # Unauthenticated, like any Prometheus scrape target: keep it off the public ingress
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,46 @@
+# –––––––––––––––––– IMPORTS –––––––––––––––––– #
+
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from app.app_core.domain.schemas.review_schemas import ReviewCreateSchema, ReviewResponseSchema
+from app.app_core.domain.models.user_model import UserModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.app_dependencies.dependencies import get_db, get_read_db
+from app.app_core.domain.services import review_service
+from app.infrastructure.auth_backend import current_user
+from app.infrastructure.etag import check_etag
+from app.infrastructure.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from typing import List, Optional
+
+# –––––––––––––––––– ROUTER –––––––––––––––––– #
+
+router = APIRouter(prefix='/cafes', tags=['reviews'])
+
+
+# –––––––––––––––––– ROUTES –––––––––––––––––– #
+
+@router.post('/{cafe_id}/reviews', response_model=ReviewResponseSchema, status_code=201)
+async def create_review(cafe_id: int, review_data: ReviewCreateSchema, db: AsyncSession = Depends(get_db),
+                        user: UserModel = Depends(current_user)):
+    return await review_service.create_review(db, cafe_id, review_data, user)
+
+
+@router.get('/{cafe_id}/reviews', response_model=List[ReviewResponseSchema])
+async def read_reviews(cafe_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_read_db),
+                       limit: int = Query(20, ge=1, le=100),
+                       cursor: Optional[str] = Query(None, description=f'Opaque token from the {NEXT_CURSOR_HEADER} header')):
+    if not_modified := check_etag(request, response, 'reviews'):
+        return not_modified
+    after = None
+    if cursor:
+        created_at, review_id = decode_cursor(cursor, size=2)
+        try:
+            after = (datetime.fromisoformat(created_at), review_id)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail='Invalid pagination cursor') from e
+        if not isinstance(review_id, int):
+            raise HTTPException(status_code=400, detail='Invalid pagination cursor')
+    reviews = await review_service.get_reviews(db, cafe_id, limit, after)
+    if len(reviews) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(reviews[-1].created_at.isoformat(), reviews[-1].id)
+    return reviews
@@ -0,0 +1,18 @@
+# –––––––––––––––––– IMPORTS –––––––––––––––––– #
+
+from fastapi import APIRouter, Depends
+from app.app_core.domain.models.user_model import UserModel
+from app.infrastructure.auth_backend import current_superuser
+from app.infrastructure.cache import cache_stats
+from typing import Any, Dict, List
+
+# –––––––––––––––––– ROUTER –––––––––––––––––– #
+
+router = APIRouter(prefix='/system', tags=['system'])
+
+
+# –––––––––––––––––– ROUTES –––––––––––––––––– #
+
+@router.get('/caches')
+async def get_cache_stats(_user: UserModel = Depends(current_superuser)) -> List[Dict[str, Any]]:
+    return cache_stats()
@@ -0,0 +1,101 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+ACCESS_LOGGER_NAME = 'app.access'
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+
+class AccessLogFormatter(logging.Formatter):
+    """One JSON object per line: the record's ``access`` fields plus time and level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, 'access', None)
+        if fields is None:
+            return super().format(record)
+        return json.dumps({'time': self.formatTime(record), 'level': record.levelname, **fields}, ensure_ascii=False)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    # The base class formats every record before enqueueing it, i.e. on the request path. The queue
+    # never leaves the process, so records are passed as they are and formatted by the listener thread
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_access_log(handler: Optional[logging.Handler] = None) -> QueueListener:
+    """
+    Route the access logger through an in-memory queue drained by a background thread, so a
+    request only pays for building the record, never for formatting or writing it.
+    """
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(AccessLogFormatter())
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    access_logger.handlers = [_InProcessQueueHandler(records)]
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    listener = QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    # Flushes whatever is still queued on interpreter exit
+    atexit.register(listener.stop)
+    return listener
+
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI middleware writing one access record per HTTP request: method, path, status, response
+    bytes and latency. Successful (2xx) responses are logged with probability ``success_sample_rate``;
+    every other status is always logged. Sampled records carry the rate so counts can be scaled back.
+    """
+
+    def __init__(self, app, success_sample_rate: float = 1.0):
+        self.app = app
+        self.success_sample_rate = success_sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_bytes
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            elif message['type'] == 'http.response.body':
+                response_bytes += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # The traceback itself is logged by the application's exception handler
+            self._log(scope, 500, response_bytes, start, error=type(e).__name__)
+            raise
+        self._log(scope, status_code, response_bytes, start)
+
+    def _log(self, scope, status_code: int, response_bytes: int, start: float, error: Optional[str] = None) -> None:
+        sample_rate = self.success_sample_rate if 200 <= status_code < 300 else 1.0
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return
+        client = scope.get('client')
+        fields = {
+            'method': scope['method'],
+            'path': scope['path'],
+            'status': status_code,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            'bytes': response_bytes,
+            'client': client[0] if client else None,
+            'sample_rate': sample_rate,
+        }
+        if error:
+            fields['error'] = error
+        access_logger.log(logging.ERROR if status_code >= 500 else logging.INFO, 'access', extra={'access': fields})
@@ -0,0 +1,72 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+
+class TTLCache:
+    """
+    In-process LRU cache with a per-entry time to live.
+
+    Every instance registers itself under ``name`` so its hit/miss counters can be reported by
+    ``cache_stats``. Entries are per worker process; the TTL bounds staleness across processes.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation, so a value loaded before a concurrent write is not stored after it
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        _caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        if self.maxsize <= 0 or (generation is not None and generation != self.generation):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+_caches: Dict[str, TTLCache] = {}
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    return [cache.stats() for cache in _caches.values()]
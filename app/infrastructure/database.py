@@ -1,12 +1,103 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from app.app_configs import Configs
 
 load_dotenv()
 SQLALCHEMY_DATABASE_URL = os.getenv('SQLALCHEMY_DATABASE_URL', 'sqlite+aiosqlite:///./test.db')
+# Replica for read-only traffic; unset means "the primary" (a read-only pool of its own on SQLite)
+SQLALCHEMY_READ_DATABASE_URL = os.getenv('SQLALCHEMY_READ_DATABASE_URL')
+
+# Applied to every new SQLite connection: WAL lets readers run alongside the writer, NORMAL sync is
+# durable enough under WAL, and busy_timeout makes a locked write wait instead of failing at once
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': Configs.SQLITE_BUSY_TIMEOUT_MS,
+    'mmap_size': Configs.SQLITE_MMAP_SIZE,
+    'cache_size': -Configs.SQLITE_CACHE_SIZE_KIB,  # negative: KiB rather than pages
+}
+
+# Read-only connections cannot switch the journal mode; query_only guards against stray writes
+SQLITE_READ_PRAGMAS = {
+    'busy_timeout': Configs.SQLITE_BUSY_TIMEOUT_MS,
+    'mmap_size': Configs.SQLITE_MMAP_SIZE,
+    'cache_size': -Configs.SQLITE_CACHE_SIZE_KIB,
+    'query_only': 'ON',
+}
+
+
+# Default loader of every relationship. Under strict loading, touching a relationship the query did
+# not load (i.e. an implicit per-row query, which under asyncio fails late and obscurely) raises
+# at once; repositories name the loaders they need in their query options.
+RELATIONSHIP_LAZY = 'raise_on_sql' if Configs.ORM_STRICT_LOADING else 'select'
+
+
+def engine_options(url: str) -> dict:
+    """create_async_engine keyword arguments for ``url`` under the Configs.ENV profile."""
+    options = {'echo': Configs.DB_ECHO}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == 'postgresql':
+        options.update(
+            pool_size=Configs.DB_POOL_SIZE,
+            max_overflow=Configs.DB_MAX_OVERFLOW,
+            pool_timeout=Configs.DB_POOL_TIMEOUT,
+            pool_recycle=Configs.DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+    if parsed.get_driver_name() == 'asyncpg' and 'prepared_statement_cache_size' not in parsed.query:
+        # The same few statements run on every request: once prepared on a connection, they skip
+        # the parse/plan round trip. A size set in the URL itself wins
+        options['connect_args'] = {'prepared_statement_cache_size': Configs.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    return options
+
+
+def _pragma_setter(pragmas: dict):
+    def set_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+    return set_pragmas
+
+
+def create_engine_for(url: str, read_only: bool = False) -> AsyncEngine:
+    engine = create_async_engine(url, **engine_options(url))
+    if engine.dialect.name == 'sqlite':
+        pragmas = SQLITE_READ_PRAGMAS if read_only else SQLITE_PRAGMAS
+        event.listen(engine.sync_engine, 'connect', _pragma_setter(pragmas))
+    return engine
+
+
+def sqlite_read_only_url(url: str) -> str:
+    """The same SQLite file opened through a ``mode=ro`` URI; in-memory databases are returned unchanged."""
+    parsed = make_url(url)
+    if not parsed.database or parsed.database == ':memory:' or parsed.database.startswith('file:'):
+        return url
+    return parsed.set(database=f'file:{parsed.database}', query={**parsed.query, 'mode': 'ro', 'uri': 'true'}) \
+        .render_as_string(hide_password=False)
+
+
+def _create_read_engine() -> AsyncEngine:
+    if SQLALCHEMY_READ_DATABASE_URL:
+        return create_engine_for(SQLALCHEMY_READ_DATABASE_URL, read_only=True)
+    if make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == 'sqlite':
+        read_url = sqlite_read_only_url(SQLALCHEMY_DATABASE_URL)
+        if read_url != SQLALCHEMY_DATABASE_URL:
+            # Under WAL these connections read concurrently with the writer instead of queueing behind it
+            return create_engine_for(read_url, read_only=True)
+    return async_engine
+
 
 Base = declarative_base()
-async_engine: AsyncEngine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+async_engine: AsyncEngine = create_engine_for(SQLALCHEMY_DATABASE_URL)
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine, autocommit=False, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+# GET traffic: a replica, a read-only SQLite pool, or simply the primary engine
+async_read_engine: AsyncEngine = _create_read_engine()
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autocommit=False, autoflush=False, expire_on_commit=False, class_=AsyncSession)
@@ -0,0 +1,18 @@
+from sqlalchemy.exc import IntegrityError
+
+# SQLSTATE class 23 code PostgreSQL (asyncpg, psycopg) reports for a unique index violation
+PG_UNIQUE_VIOLATION = '23505'
+# Extended result codes sqlite3 exposes as ``sqlite_errorname`` (Python >= 3.11)
+SQLITE_UNIQUE_VIOLATIONS = frozenset({'SQLITE_CONSTRAINT_UNIQUE', 'SQLITE_CONSTRAINT_PRIMARYKEY'})
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """
+    Whether ``error`` is a unique/primary key violation, as opposed to e.g. a NOT NULL or foreign
+    key failure. Decided from the driver's error code, not from its (localized) message text.
+    """
+    orig = error.orig
+    sqlstate = getattr(orig, 'sqlstate', None) or getattr(orig, 'pgcode', None)
+    if sqlstate is not None:
+        return sqlstate == PG_UNIQUE_VIOLATION
+    return getattr(orig, 'sqlite_errorname', None) in SQLITE_UNIQUE_VIOLATIONS
@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from typing import Callable, Dict, List, Set
+from sqlalchemy import column, event, select, table, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from starlette.responses import Response
+from app.infrastructure.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# –––––––––––––––––– TABLE VERSIONS –––––––––––––––––– #
+# Write counters live in the table_versions table, one row per entry of VERSIONED_TABLES. A writing
+# transaction only records which tables it touched; their rows are bumped in a short transaction of
+# their own right after it commits, so concurrent writers never queue on a version row's lock for the
+# length of their work (the new version can only trail the data, never precede it).
+# Each process reads them through _versions: its own commits update it at once, other workers'
+# commits are picked up by refresh_table_versions every Configs.TABLE_VERSION_REFRESH_INTERVAL s,
+# which bounds how long another worker can answer 304 for data that has since changed.
+
+# 'cafe_content' is not a table: it moves only with cafe titles, descriptions and categories (the
+# similar-cafes features), whereas 'cafes' also moves with every review and ranking refresh
+CAFE_CONTENT_VERSION = 'cafe_content'
+VERSIONED_TABLES = ('cafes', 'cafe_categories', 'categories', 'reviews', CAFE_CONTENT_VERSION)
+
+_table_versions = table('table_versions', column('name'), column('version'))
+
+# Last known version per table; empty until the first refresh
+_versions: Dict[str, int] = {}
+# Tables describing state held by this process only (e.g. an in-memory index), see process_local_table
+_local_versions: Dict[str, int] = {}
+# Tags built from process-local versions, or before the first refresh, include this boot id and so
+# never match a tag handed out by another process or by a previous run of this one
+_BOOT_ID = uuid.uuid4().hex
+
+# Called with the tables whose version was changed by another process
+_change_listeners: List[Callable[[Set[str]], None]] = []
+
+_WRITTEN_TABLES = 'written_versioned_tables'
+
+
+def process_local_table(name: str) -> str:
+    """Register ``name`` as an ETag "table" versioned per process with bump_local_table_version."""
+    _local_versions.setdefault(name, 0)
+    return name
+
+
+def bump_local_table_version(name: str) -> None:
+    _local_versions[name] += 1
+
+
+def bump_table_version(db: AsyncSession | Session, *tables: str) -> None:
+    """
+    Bump the versions of ``tables`` once the current transaction of ``db`` commits; nothing is bumped
+    if it rolls back. Also usable from sync code inside a flush, e.g. mapper events.
+    """
+    db.info.setdefault(_WRITTEN_TABLES, set()).update(tables)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_tables(session: Session) -> None:
+    tables = session.info.pop(_WRITTEN_TABLES, None)
+    if not tables:
+        return
+    # The session's own transaction is over and cannot run SQL any more: a second connection does
+    try:
+        with session.get_bind().begin() as connection:
+            result = connection.execute(
+                update(_table_versions)
+                .where(_table_versions.c.name.in_(tables))
+                .values(version=_table_versions.c.version + 1)
+                .returning(_table_versions.c.name, _table_versions.c.version)
+            )
+            versions = result.all()
+    except SQLAlchemyError:
+        # The data is committed either way; the tags catch up with the next write to these tables
+        logger.exception('Bumping table versions %s failed', sorted(tables))
+        return
+    for name, version in versions:
+        # max: the commits of two concurrent sessions may be processed out of order
+        _versions[name] = max(_versions.get(name, 0), version)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_written_tables(session: Session) -> None:
+    session.info.pop(_WRITTEN_TABLES, None)
+
+
+def on_table_version_change(listener: Callable[[Set[str]], None]) -> None:
+    """Call ``listener`` with the changed tables whenever a refresh sees another process's writes."""
+    _change_listeners.append(listener)
+
+
+async def refresh_table_versions(db: AsyncSession) -> Set[str]:
+    """Load the current versions from the database; returns the tables changed by other processes."""
+    result = await db.execute(select(_table_versions.c.name, _table_versions.c.version))
+    versions = dict(result.all())
+    changed = {name for name, version in versions.items() if _versions.get(name) != version}
+    _versions.update(versions)
+    if changed:
+        for listener in _change_listeners:
+            listener(changed)
+    return changed
+
+
+async def refresh_table_versions_periodically(interval: float) -> None:
+    """Background loop started from the app lifespan."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await refresh_table_versions(db)
+        except Exception:
+            logger.exception('Table version refresh failed')
+        await asyncio.sleep(interval)
+
+
+def table_version(*tables: str) -> str:
+    parts = []
+    for name in tables:
+        if name in _local_versions:
+            parts.append(f'{name}:{_BOOT_ID}.{_local_versions[name]}')
+        elif name in _versions:
+            parts.append(f'{name}:{_versions[name]}')
+        else:
+            parts.append(f'{name}:{_BOOT_ID}')
+    return ','.join(parts)
+
+
+def make_etag(request: Request, *tables: str) -> str:
+    query = '&'.join(sorted(f'{key}={value}' for key, value in request.query_params.multi_items()))
+    key = f'{table_version(*tables)}|{request.url.path}?{query}'
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == '*':
+        return True
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2)
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+
+def check_etag(request: Request, response: Response, *tables: str) -> Response | None:
+    """
+    Tag the response with an ETag derived from the versions of ``tables`` and the query string.
+    Returns a ready 304 response when the client already holds that tag, so the caller can return
+    before touching the database or the serializer.
+    """
+    etag = make_etag(request, *tables)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,34 @@
+import time
+from sqlalchemy import column, table, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# –––––––––––––––––– JOB LEASES –––––––––––––––––– #
+# Every worker runs the same background loops; a job that should run once per interval across all
+# of them first claims its job_leases row. The claim is a single conditional UPDATE, so exactly one
+# process wins it on any database, without holding a lock while the job runs.
+
+RANKING_REFRESH_JOB = 'ranking_refresh'
+SIMILAR_INDEX_JOB = 'similar_index_rebuild'
+LEASED_JOBS = (RANKING_REFRESH_JOB, SIMILAR_INDEX_JOB)
+
+_job_leases = table('job_leases', column('name'), column('expires_at'))
+
+
+async def claim_job(db: AsyncSession, name: str, duration: float) -> bool:
+    """
+    Take the lease on job ``name`` for ``duration`` seconds if nobody holds it; True if this process
+    should run the job now. The lease is simply left to expire, so a crashed holder blocks no one.
+    """
+    now = time.time()
+    try:
+        result = await db.execute(
+            update(_job_leases)
+            .where(_job_leases.c.name == name, _job_leases.c.expires_at <= now)
+            .values(expires_at=now + duration)
+        )
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise
+    return result.rowcount == 1
@@ -0,0 +1,196 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.infrastructure.cache import cache_stats
+
+# Metrics are process-local and updated without locks: requests and SQLAlchemy pool events all run
+# on the event loop thread, so an update is a plain dict/list write. With several workers each
+# process exposes its own series and Prometheus aggregates them.
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; dense below 100 ms, where most requests land
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _series(name: str, labelnames: Sequence[str], labels: Tuple[str, ...], value: float) -> str:
+    if not labelnames:
+        return f'{name} {value}'
+    pairs = ','.join(f'{label}="{_escape(str(v))}"' for label, v in zip(labelnames, labels))
+    return f'{name}{{{pairs}}} {value}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] += amount
+
+    def set(self, *labels: str, value: float) -> None:
+        self.values[labels] = value
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self.values.items():
+            yield _series(self.name, self.labelnames, labels, value)
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] -= amount
+
+
+class Histogram:
+    """Fixed-bucket histogram: an observation is one bisect and two list writes."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: non-cumulative bucket counts (the last one is +Inf) and the running sum
+        self.counts: Dict[Tuple[str, ...], List[int]] = {}
+        self.sums: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    def samples(self) -> Iterator[str]:
+        bucket_labelnames = (*self.labelnames, 'le')
+        for labels, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                yield _series(f'{self.name}_bucket', bucket_labelnames, (*labels, bound), cumulative)
+            yield _series(f'{self.name}_sum', self.labelnames, labels, self.sums[labels])
+            yield _series(f'{self.name}_count', self.labelnames, labels, cumulative)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: List[Counter | Histogram] = []
+        # Run before every scrape, for values that are cheaper to read than to track
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        for collect in self.collectors:
+            collect()
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    'http_requests_total', 'HTTP requests by route template and status', ('method', 'route', 'status')))
+http_request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route template', ('method', 'route')))
+http_requests_in_flight = registry.register(Gauge(
+    'http_requests_in_flight', 'HTTP requests currently being served'))
+db_pool_checkouts = registry.register(Counter(
+    'db_pool_checkouts_total', 'Connections checked out of the pool', ('engine',)))
+db_pool_connections_opened = registry.register(Counter(
+    'db_pool_connections_opened_total', 'New DBAPI connections opened by the pool', ('engine',)))
+db_pool_in_use = registry.register(Gauge(
+    'db_pool_connections_in_use', 'Connections currently checked out of the pool', ('engine',)))
+cache_hits = registry.register(Counter('cache_hits_total', 'In-process cache hits', ('cache',)))
+cache_misses = registry.register(Counter('cache_misses_total', 'In-process cache misses', ('cache',)))
+cache_hit_ratio = registry.register(Gauge('cache_hit_ratio', 'In-process cache hits / lookups', ('cache',)))
+cache_entries = registry.register(Gauge('cache_entries', 'Entries held by the in-process cache', ('cache',)))
+
+
+def _collect_cache_stats() -> None:
+    for stats in cache_stats():
+        cache_hits.set(stats['name'], value=stats['hits'])
+        cache_misses.set(stats['name'], value=stats['misses'])
+        cache_hit_ratio.set(stats['name'], value=stats['hit_ratio'])
+        cache_entries.set(stats['name'], value=stats['size'])
+
+
+registry.collectors.append(_collect_cache_stats)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Count pool checkouts, checkins and new connections of ``engine`` under the ``engine=name`` label."""
+    sync_engine = engine.sync_engine
+    db_pool_in_use.set(name, value=0)
+
+    @event.listens_for(sync_engine, 'connect')
+    def on_connect(_dbapi_connection, _connection_record):
+        db_pool_connections_opened.inc(name)
+
+    @event.listens_for(sync_engine, 'checkout')
+    def on_checkout(_dbapi_connection, _connection_record, _connection_proxy):
+        db_pool_checkouts.inc(name)
+        db_pool_in_use.inc(name)
+
+    @event.listens_for(sync_engine, 'checkin')
+    def on_checkin(_dbapi_connection, _connection_record):
+        db_pool_in_use.dec(name)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count, latency and concurrency. Requests are labelled
+    with the matched route's path template (``/cafes/{cafe_id}``), never the raw path, so the
+    number of series stays bounded; requests that match no route share the '<unmatched>' label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            http_requests_in_flight.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get('route')
+            route_path = getattr(route, 'path', '<unmatched>')
+            http_requests.inc(scope['method'], route_path, str(status_code))
+            http_request_duration.observe(time.perf_counter() - start, scope['method'], route_path)
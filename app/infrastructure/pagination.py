@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+from typing import Any, List
+from fastapi import HTTPException
+
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+# Cursor integers are bound to BIGINT/INTEGER columns; anything outside would overflow the driver
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last returned row into an opaque, URL-safe token."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _reject_constant(name: str) -> None:
+    raise ValueError(f'{name} is not a valid cursor value')
+
+
+def _valid_value(value: Any) -> bool:
+    # No cursor is encoded with booleans, and True would pass for the integer 1
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return _INT64_MIN <= value <= _INT64_MAX
+    return True
+
+
+def decode_cursor(cursor: str, size: int = 1) -> List[Any]:
+    """
+    The ``size`` values packed by encode_cursor; a 400 for anything a client may have tampered with
+    into a shape no cursor has (wrong length, booleans, NaN/Infinity, integers beyond 64 bits).
+    Callers still check the type each value must have.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()), parse_constant=_reject_constant)
+    except (binascii.Error, ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail='Invalid pagination cursor') from e
+    if not isinstance(values, list) or len(values) != size or not all(_valid_value(value) for value in values):
+        raise HTTPException(status_code=400, detail='Invalid pagination cursor')
+    return values
@@ -0,0 +1,98 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional, Sequence
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueryStats:
+    """SQL statements run on behalf of one HTTP request: count, total time and repeats per statement."""
+
+    __slots__ = ('statements', 'duration', 'shapes')
+
+    def __init__(self):
+        self.statements = 0
+        self.duration = 0.0
+        # Keyed by the SQL text with placeholders, so the same query with other parameters counts together
+        self.shapes: Counter = Counter()
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.statements} queries"'
+
+
+# Set by QueryStatsMiddleware for the duration of a request; None outside requests (startup,
+# background refreshes). SQLAlchemy's asyncio greenlets run in the calling task's context, so the
+# cursor events below see the value of the request that awaited the query.
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar('current_query_stats', default=None)
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get('query_start')
+    if starts:
+        stats.duration += time.perf_counter() - starts.pop()
+    stats.statements += 1
+    stats.shapes[statement] += 1
+
+
+def track_queries(engine: AsyncEngine) -> None:
+    """Attribute every statement ``engine`` executes to the request it runs for."""
+    event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware collecting RequestQueryStats per request. The statement count and DB time
+    so far are sent in a ``Server-Timing`` header, with a ``Timing-Allow-Origin`` listing
+    ``timing_allow_origins`` so cross-origin pages can read it through the Resource Timing API; once
+    the request is done, any statement that ran more than ``repeat_threshold`` times is logged as a
+    likely N+1 (0 disables the check).
+    """
+
+    def __init__(self, app, server_timing: bool = True, repeat_threshold: int = 10,
+                 timing_allow_origins: Sequence[str] = ()):
+        self.app = app
+        self.server_timing = server_timing
+        self.repeat_threshold = repeat_threshold
+        self.timing_headers = [(b'timing-allow-origin', ', '.join(timing_allow_origins).encode())] \
+            if timing_allow_origins else []
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start' and self.server_timing and stats.statements:
+                headers = [*message.get('headers', ()), (b'server-timing', stats.server_timing().encode()),
+                           *self.timing_headers]
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            if self.repeat_threshold:
+                self._warn_repeats(scope, stats)
+
+    def _warn_repeats(self, scope, stats: RequestQueryStats) -> None:
+        for statement, count in stats.shapes.items():
+            if count > self.repeat_threshold:
+                route = getattr(scope.get('route'), 'path', scope['path'])
+                logger.warning(f"Possible N+1: statement ran {count} times in {scope['method']} {route}: "
+                               f"{' '.join(statement.split())[:200]}")
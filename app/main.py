@@ -1,47 +1,86 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.app_routers.__init__ import router
+from app.infrastructure.pagination import NEXT_CURSOR_HEADER
+from app.infrastructure.access_log import AccessLogMiddleware, configure_access_log
+from app.infrastructure.database import AsyncSessionLocal, async_engine, async_read_engine
+from app.infrastructure.etag import refresh_table_versions, refresh_table_versions_periodically
+from app.infrastructure.metrics import MetricsMiddleware, instrument_engine
+from app.infrastructure.query_stats import QueryStatsMiddleware, track_queries
+from app.app_core.domain.services.category_registry import category_registry
+from app.app_core.domain.services import ranking_service
+from app.app_core.domain.services.similarity_index import similarity_index
+from app.app_core.domain.services.city_index import city_index
+from app.app_configs import Configs
+from sqlalchemy.exc import SQLAlchemyError
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-
-import time
 
 
 logging.basicConfig(
     level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler()])
 logger = logging.getLogger(__name__)
+configure_access_log()
+instrument_engine(async_engine, 'primary')
+track_queries(async_engine)
+if async_read_engine is not async_engine:
+    instrument_engine(async_read_engine, 'read')
+    track_queries(async_read_engine)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    async with AsyncSessionLocal() as db:
+        try:
+            await refresh_table_versions(db)
+        except SQLAlchemyError:
+            # ETags stay unique to this process until the refresh loop succeeds
+            logger.warning('Table versions could not be loaded at startup')
+            await db.rollback()
+        try:
+            await category_registry.load(db)
+            await city_index.load(db)
+        except HTTPException:
+            # e.g. migrations not applied yet: both load lazily on first use instead
+            logger.warning('Category registry and city index could not be preloaded at startup')
+    # Serve the last saved index right away; the refresh loop rebuilds it in the background
+    similarity_index.load(Configs.SIMILAR_INDEX_PATH)
+    background = []
+    if Configs.TABLE_VERSION_REFRESH_INTERVAL > 0:
+        background.append(asyncio.create_task(
+            refresh_table_versions_periodically(Configs.TABLE_VERSION_REFRESH_INTERVAL)))
+    if Configs.RANKING_REFRESH_INTERVAL > 0:
+        background.append(asyncio.create_task(
+            ranking_service.refresh_rankings_periodically(Configs.RANKING_REFRESH_INTERVAL)))
+    if Configs.SIMILAR_REFRESH_INTERVAL > 0:
+        background.append(asyncio.create_task(
+            similarity_index.refresh_periodically(Configs.SIMILAR_REFRESH_INTERVAL, Configs.SIMILAR_INDEX_PATH)))
+    yield
+    for task in background:
+        task.cancel()
 
-app = FastAPI(title="TripAdvisor-like API")
+
+app = FastAPI(title="TripAdvisor-like API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:63343"],
+    allow_origins=Configs.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=['*'],
-    allow_headers=['*']
+    allow_headers=['*'],
+    expose_headers=[NEXT_CURSOR_HEADER, 'ETag', 'Server-Timing']
 )
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        logger.info(f"Request: {request.method} {request.url.path} from {request.client.host}")
-        try:
-            response: Response = await call_next(request)
-            process_time = time.time() - start_time
-            logger.info(f"Response: status {response.status_code}, time {process_time:.2f}s")
-            return response
-        except Exception as e:
-            logger.error(f"Error: {str(e)}")
-            raise
-
-
-app.add_middleware(LoggingMiddleware)
+app.add_middleware(AccessLogMiddleware, success_sample_rate=Configs.ACCESS_LOG_SUCCESS_SAMPLE_RATE)
+app.add_middleware(QueryStatsMiddleware, server_timing=Configs.SQL_SERVER_TIMING,
+                   repeat_threshold=Configs.SQL_REPEAT_WARNING_THRESHOLD, timing_allow_origins=Configs.CORS_ORIGINS)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.exception_handler(HTTPException)
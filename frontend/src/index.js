@@ -42,18 +42,6 @@ class Cafe {
 		this.also_good_for = data.also_good_for || [];
 	}
 
-	getNormalizedCity() {
-		return normalizeString(this.city);
-	}
-
-	getNormalizedBestFor() {
-		return normalizeString(this.best_for);
-	}
-
-	getNormalizedAlsoGoodFor() {
-		return this.also_good_for.map(normalizeString);
-	}
-
 	getFormattedAlsoGoodFor() {
 		return this.also_good_for.join(', ') || 'None';
 	}
@@ -72,54 +60,30 @@ class ApiService {
 		return await this.httpClient.get(categoriesUrl);
 	}
 
-	async loadCafes() {
-		const data = await this.httpClient.get(apiUrl);
+	async loadCafes(filters = {}) {
+		const data = await this.httpClient.get(apiUrl + CafeFilterService.toQueryString(filters));
 		return data.map(item => new Cafe(item));
 	}
 }
 
-// 7. CafeFilterService (Сервис фильтрации — отдельный компонент для логики фильтров, зависит от моделей и утилит)
+// 7. CafeFilterService (Сервис фильтрации — переводит фильтры в query-параметры GET /cafes, фильтрует сервер)
 class CafeFilterService {
-	static filter(cafes, filters) {
-		return cafes
-			.filter(cafe => this.matchCity(cafe, filters.city))
-			.filter(cafe => this.matchBestFor(cafe, filters.bestFor))
-			.filter(cafe => this.matchAlsoGoodFor(cafe, filters.alsoGoodFor));
-	}
-
-	static matchCity(cafe, city) {
-		const norm = normalizeString(city);
-		return !norm || cafe.getNormalizedCity().includes(norm);
-	}
-
-	static matchBestFor(cafe, bestFor) {
-		const norm = normalizeString(bestFor);
-		return !norm ||
-			cafe.getNormalizedBestFor().includes(norm) ||
-			cafe.getNormalizedAlsoGoodFor().some(cat => cat.includes(norm));
-	}
-
-	static matchAlsoGoodFor(cafe, tags) {
-		const normTags = (tags || []).map(normalizeString);
-		return normTags.length === 0 ||
-			cafe.getNormalizedAlsoGoodFor().some(cat => normTags.includes(cat));
-	}
-}
-
-// 7. CafeSorterService (Сервис сортировки — отдельный компонент для упорядочивания результатов по релевантности)
-class CafeSorterService {
-	static sortByBestForRelevance(cafes, bestFor) {
-		const bestForNorm = normalizeString(bestFor || '');
-		if (!bestForNorm) {
-			return cafes; // Нет фильтра — не сортируем, возвращаем как есть
+	static toQueryString(filters) {
+		const params = new URLSearchParams();
+		const city = normalizeString(filters.city);
+		if (city) {
+			// Подстрока, как раньше на клиенте, а не только начало названия
+			params.set('city', city);
+			params.set('city_match', 'contains');
 		}
-
-		// Сортировка: прямые совпадения (в best_for) выше косвенных (в also_good_for)
-		return cafes.slice().sort((a, b) => {
-			const aDirect = a.getNormalizedBestFor().includes(bestForNorm);
-			const bDirect = b.getNormalizedBestFor().includes(bestForNorm);
-			return aDirect === bDirect ? 0 : aDirect ? -1 : 1;
-		});
+		if (filters.bestFor) {
+			// Категория как основная или дополнительная; основные совпадения сервер отдаёт первыми
+			params.set('best_for', filters.bestFor);
+			params.set('best_for_match', 'any');
+		}
+		(filters.alsoGoodFor || []).forEach(tag => params.append('also_good_for', tag));
+		const query = params.toString();
+		return query ? `?${query}` : '';
 	}
 }
 
@@ -141,7 +105,7 @@ class AppState {
 		this.dispatchChange();
 		try {
 			this.categories = await apiService.loadCategories();
-			this.cafes = await apiService.loadCafes();
+			this.cafes = await apiService.loadCafes(this.getFilters());
 		} catch (error) {
 			this.error = `Initialization error: ${error.message}`;
 		} finally {
@@ -150,35 +114,52 @@ class AppState {
 		}
 	}
 
+	async reloadCafes() {
+		this.isLoading = true;
+		this.error = null;
+		this.dispatchChange();
+		try {
+			this.cafes = await apiService.loadCafes(this.getFilters());
+		} catch (error) {
+			this.error = `Loading error: ${error.message}`;
+		} finally {
+			this.isLoading = false;
+			this.dispatchChange();
+		}
+	}
+
 	setCityQuery(query) {
 		this.cityQuery = query || '';
-		this.dispatchChange();
+		return this.reloadCafes();
 	}
 
 	setBestFor(value) {
 		this.bestFor = value || '';
-		this.dispatchChange();
+		return this.reloadCafes();
 	}
 
 	setAlsoGoodFor(values) {
 		this.alsoGoodFor = values || [];
-		this.dispatchChange();
+		return this.reloadCafes();
 	}
 
 	resetFilters() {
 		this.cityQuery = '';
 		this.bestFor = '';
 		this.alsoGoodFor = [];
-		this.dispatchChange();
+		return this.reloadCafes();
 	}
 
-	getFilteredCafes() {
-		const filtered = CafeFilterService.filter(this.cafes, {
+	getFilters() {
+		return {
 			city: this.cityQuery,
 			bestFor: this.bestFor,
 			alsoGoodFor: this.alsoGoodFor
-		});
-		return CafeSorterService.sortByBestForRelevance(filtered, this.bestFor);
+		};
+	}
+
+	getFilteredCafes() {
+		return this.cafes; // Уже отфильтровано сервером
 	}
 
 	onChange(callback) {
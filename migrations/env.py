@@ -23,14 +23,26 @@ if config.config_file_name is not None:
 config.set_main_option('sqlalchemy.url', DATABASE_URL)
 
 import app.app_core.domain.models   # noqa: F401
+from app.app_core.domain.models.cafe_search_index import CAFE_FTS_TABLE, CAFE_SEARCH_INDEX
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    # The FTS5 virtual table and its shadow tables are managed by raw DDL, not by the metadata
+    if type_ == 'table' and reflected and name.startswith(CAFE_FTS_TABLE):
+        return False
+    # Likewise the PostgreSQL tsvector expression index
+    if type_ == 'index' and reflected and name == CAFE_SEARCH_INDEX:
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option('sqlalchemy.url')
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={'paramstyle': 'named'},
     )
@@ -51,6 +63,7 @@ async def run_migrations_online():
             lambda sync_conn: context.configure(
                 connection=sync_conn,
                 target_metadata=target_metadata,
+                include_object=include_object,
                 compare_type=True
             )
         )
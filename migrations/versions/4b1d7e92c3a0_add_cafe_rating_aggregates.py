@@ -0,0 +1,45 @@
+"""Add cafe rating aggregates
+
+Revision ID: 4b1d7e92c3a0
+Revises: cfaa695d056a
+Create Date: 2026-10-18 13:40:12.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1d7e92c3a0'
+down_revision: Union[str, Sequence[str], None] = 'cfaa695d056a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cafes', sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('cafes', sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill by primary key ranges so a large catalog is not rewritten in one statement
+    connection = op.get_bind()
+    max_id = connection.execute(sa.text('SELECT MAX(id) FROM cafes')).scalar() or 0
+    backfill = sa.text(
+        'UPDATE cafes SET '
+        'rating_sum = (SELECT COALESCE(SUM(reviews.rating), 0) FROM reviews WHERE reviews.cafe_id = cafes.id), '
+        'rating_count = (SELECT COUNT(*) FROM reviews WHERE reviews.cafe_id = cafes.id) '
+        'WHERE cafes.id > :low AND cafes.id <= :high'
+    )
+    for low in range(0, max_id, BACKFILL_BATCH_SIZE):
+        connection.execute(backfill, {'low': low, 'high': low + BACKFILL_BATCH_SIZE})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cafes') as batch_op:
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
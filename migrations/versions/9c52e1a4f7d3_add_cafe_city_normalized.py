@@ -0,0 +1,44 @@
+"""Add cafe city_normalized
+
+Revision ID: 9c52e1a4f7d3
+Revises: 4b1d7e92c3a0
+Create Date: 2026-10-18 14:05:41.620317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.app_core.domain.models.cafe_model import normalize_city
+
+# revision identifiers, used by Alembic.
+revision: str = '9c52e1a4f7d3'
+down_revision: Union[str, Sequence[str], None] = '4b1d7e92c3a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cafes', sa.Column('city_normalized', sa.String(length=100), server_default='', nullable=False))
+
+    # Normalization is Unicode-aware Python, so backfill distinct cities in batches
+    connection = op.get_bind()
+    cities = [row[0] for row in connection.execute(sa.text('SELECT DISTINCT city FROM cafes'))]
+    backfill = sa.text('UPDATE cafes SET city_normalized = :city_normalized WHERE city = :city')
+    for start in range(0, len(cities), BACKFILL_BATCH_SIZE):
+        connection.execute(backfill, [
+            {'city': city, 'city_normalized': normalize_city(city)}
+            for city in cities[start:start + BACKFILL_BATCH_SIZE]
+        ])
+    op.create_index('idx_cafe_city_normalized', 'cafes', ['city_normalized'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cafe_city_normalized', table_name='cafes')
+    with op.batch_alter_table('cafes') as batch_op:
+        batch_op.drop_column('city_normalized')
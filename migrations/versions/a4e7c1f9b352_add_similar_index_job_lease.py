@@ -0,0 +1,33 @@
+"""Add the similar_index_rebuild job lease
+
+Revision ID: a4e7c1f9b352
+Revises: f2b6d8e1a437
+Create Date: 2026-10-18 15:48:12.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e7c1f9b352'
+down_revision: Union[str, Sequence[str], None] = 'f2b6d8e1a437'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.infrastructure.job_lease.SIMILAR_INDEX_JOB
+SIMILAR_INDEX_JOB = 'similar_index_rebuild'
+
+_job_leases = sa.table('job_leases', sa.column('name', sa.String), sa.column('expires_at', sa.Float))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.bulk_insert(_job_leases, [{'name': SIMILAR_INDEX_JOB, 'expires_at': 0.0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(_job_leases.delete().where(_job_leases.c.name == SIMILAR_INDEX_JOB))
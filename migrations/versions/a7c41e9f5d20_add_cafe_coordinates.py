@@ -0,0 +1,36 @@
+"""Add cafe coordinates and geohash
+
+Revision ID: a7c41e9f5d20
+Revises: f3b9d2c6a481
+Create Date: 2026-10-18 18:10:32.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c41e9f5d20'
+down_revision: Union[str, Sequence[str], None] = 'f3b9d2c6a481'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing cafes have no coordinates yet, so there is nothing to backfill
+    op.add_column('cafes', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('cafes', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('cafes', sa.Column('geohash', sa.String(length=9), nullable=True))
+    op.create_index('idx_cafe_geohash', 'cafes', ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cafe_geohash', table_name='cafes')
+    # Plain DROP COLUMN (SQLite >= 3.35): a batch rebuild of cafes would drop the cafes_fts triggers
+    op.drop_column('cafes', 'geohash')
+    op.drop_column('cafes', 'longitude')
+    op.drop_column('cafes', 'latitude')
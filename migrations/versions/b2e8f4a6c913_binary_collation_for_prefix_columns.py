@@ -0,0 +1,40 @@
+"""Binary collation for prefix-filtered columns
+
+Revision ID: b2e8f4a6c913
+Revises: a7c41e9f5d20
+Create Date: 2026-10-18 21:02:17.304518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e8f4a6c913'
+down_revision: Union[str, Sequence[str], None] = 'a7c41e9f5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The city and nearby filters range-scan these columns by prefix, see cafe_model.binary_string
+PREFIX_COLUMNS = (('city_normalized', 100, False), ('geohash', 9, True))
+
+
+def _set_collation(collation: str | None) -> None:
+    # SQLite already compares with BINARY, so only PostgreSQL changes; the indexes are rebuilt with the column
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column, length, nullable in PREFIX_COLUMNS:
+        op.alter_column('cafes', column, type_=sa.String(length=length, collation=collation),
+                        existing_type=sa.String(length=length), existing_nullable=nullable)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _set_collation('C')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_collation('default')
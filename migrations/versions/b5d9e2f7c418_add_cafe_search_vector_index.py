@@ -0,0 +1,37 @@
+"""Add the PostgreSQL full-text index on cafes
+
+Revision ID: b5d9e2f7c418
+Revises: a4e7c1f9b352
+Create Date: 2026-10-18 16:21:37.884120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d9e2f7c418'
+down_revision: Union[str, Sequence[str], None] = 'a4e7c1f9b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.app_core.domain.models.cafe_search_index at this revision
+CAFE_SEARCH_INDEX = 'idx_cafe_search_vector'
+CAFE_SEARCH_VECTOR_SQL = ("setweight(to_tsvector('simple', title), 'A') || "
+                          "setweight(to_tsvector('simple', description), 'B')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite searches through the FTS5 table of d81f3a6b0e27 instead
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f'CREATE INDEX IF NOT EXISTS {CAFE_SEARCH_INDEX} ON cafes USING gin (({CAFE_SEARCH_VECTOR_SQL}))')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f'DROP INDEX IF EXISTS {CAFE_SEARCH_INDEX}')
@@ -0,0 +1,37 @@
+"""Add table_versions
+
+Revision ID: c6d1a9e3f284
+Revises: b2e8f4a6c913
+Create Date: 2026-10-18 22:14:05.918342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d1a9e3f284'
+down_revision: Union[str, Sequence[str], None] = 'b2e8f4a6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.infrastructure.etag.VERSIONED_TABLES at this revision
+VERSIONED_TABLES = ('cafes', 'cafe_categories', 'categories', 'reviews')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table_versions = op.create_table(
+        'table_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table_versions, [{'name': name, 'version': 0} for name in VERSIONED_TABLES])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_versions')
@@ -0,0 +1,30 @@
+"""Add cafe_content table version
+
+Revision ID: d3f7b5c8e016
+Revises: c6d1a9e3f284
+Create Date: 2026-10-18 22:51:39.207764
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f7b5c8e016'
+down_revision: Union[str, Sequence[str], None] = 'c6d1a9e3f284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_table_versions = sa.table('table_versions', sa.column('name', sa.String), sa.column('version', sa.BigInteger))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.bulk_insert(_table_versions, [{'name': 'cafe_content', 'version': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(_table_versions.delete().where(_table_versions.c.name == 'cafe_content'))
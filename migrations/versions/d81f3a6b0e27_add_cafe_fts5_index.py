@@ -0,0 +1,36 @@
+"""Add cafe FTS5 search index
+
+Revision ID: d81f3a6b0e27
+Revises: 9c52e1a4f7d3
+Create Date: 2026-10-18 14:31:08.274915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.app_core.domain.models.cafe_search_index import (
+    CAFE_FTS_CREATE_STATEMENTS, CAFE_FTS_DROP_STATEMENTS, CAFE_FTS_REBUILD_STATEMENT)
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f3a6b0e27'
+down_revision: Union[str, Sequence[str], None] = '9c52e1a4f7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in CAFE_FTS_CREATE_STATEMENTS:
+        op.execute(statement)
+    op.execute(CAFE_FTS_REBUILD_STATEMENT)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in CAFE_FTS_DROP_STATEMENTS:
+        op.execute(statement)
@@ -0,0 +1,54 @@
+"""Add review created_at
+
+Revision ID: e5a0c7d29b14
+Revises: d81f3a6b0e27
+Create Date: 2026-10-18 16:12:08.914532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from fastapi_users_db_sqlalchemy.generics import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0c7d29b14'
+down_revision: Union[str, Sequence[str], None] = 'd81f3a6b0e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite cannot ADD COLUMN with a non-constant default, so the table is rebuilt there (PostgreSQL
+    # alters in place); existing reviews get the migration time and their relative order falls back to id
+    recreate = 'always' if op.get_bind().dialect.name == 'sqlite' else 'auto'
+    with op.batch_alter_table('reviews', recreate=recreate) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(timezone=True),
+                                      server_default=sa.func.now(), nullable=False))
+        # user_id now shares the GUID type of users.id
+        batch_op.alter_column('user_id', type_=GUID(), existing_type=sa.UUID(), existing_nullable=False)
+    if op.get_bind().dialect.name != 'postgresql':
+        # sa.UUID stored bare hex outside PostgreSQL; GUID (like users.id) stores the dashed form
+        op.execute(
+            "UPDATE reviews SET user_id = lower(substr(user_id, 1, 8) || '-' || substr(user_id, 9, 4) || '-' || "
+            "substr(user_id, 13, 4) || '-' || substr(user_id, 17, 4) || '-' || substr(user_id, 21)) "
+            "WHERE length(user_id) = 32"
+        )
+    # The composite index covers every lookup the single-column one served
+    op.create_index('idx_review_cafe_created_at', 'reviews', ['cafe_id', 'created_at'], unique=False)
+    op.drop_index('idx_review_cafe_id', table_name='reviews')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_review_cafe_id', 'reviews', ['cafe_id'], unique=False)
+    op.drop_index('idx_review_cafe_created_at', table_name='reviews')
+    if op.get_bind().dialect.name != 'postgresql':
+        op.execute("UPDATE reviews SET user_id = replace(user_id, '-', '') WHERE length(user_id) = 36")
+    # user_id keeps its CHAR(36) declaration: casting the strings back to SQLite's NUMERIC UUID
+    # affinity would zero them, and on PostgreSQL both types are already UUID
+    with op.batch_alter_table('reviews') as batch_op:
+        batch_op.drop_column('created_at')
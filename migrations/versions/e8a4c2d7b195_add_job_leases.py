@@ -0,0 +1,37 @@
+"""Add job_leases
+
+Revision ID: e8a4c2d7b195
+Revises: d3f7b5c8e016
+Create Date: 2026-10-18 23:26:48.115093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a4c2d7b195'
+down_revision: Union[str, Sequence[str], None] = 'd3f7b5c8e016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.infrastructure.job_lease.LEASED_JOBS at this revision
+LEASED_JOBS = ('ranking_refresh',)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    job_leases = op.create_table(
+        'job_leases',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('expires_at', sa.Float(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(job_leases, [{'name': name, 'expires_at': 0.0} for name in LEASED_JOBS])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_leases')
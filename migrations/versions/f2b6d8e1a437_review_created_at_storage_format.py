@@ -0,0 +1,46 @@
+"""Store review created_at defaults in SQLAlchemy's SQLite format
+
+Revision ID: f2b6d8e1a437
+Revises: e8a4c2d7b195
+Create Date: 2026-10-18 15:02:41.306518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d8e1a437'
+down_revision: Union[str, Sequence[str], None] = 'e8a4c2d7b195'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.app_core.domain.models.review_model.current_timestamp_default on SQLite at this revision
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL stores a real timestamp; only SQLite keeps the text CURRENT_TIMESTAMP wrote
+    # ('YYYY-MM-DD HH:MM:SS', no fraction), which compares below the cursors SQLAlchemy binds
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "UPDATE reviews SET created_at = strftime('%Y-%m-%d %H:%M:%f000', created_at) "
+        "WHERE created_at NOT LIKE '%.%'"
+    )
+    with op.batch_alter_table('reviews', recreate='always') as batch_op:
+        batch_op.alter_column('created_at', server_default=sa.text(SQLITE_NOW),
+                              existing_type=sa.DateTime(timezone=True), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # The normalized values stay: they are what SQLAlchemy writes anyway
+    with op.batch_alter_table('reviews', recreate='always') as batch_op:
+        batch_op.alter_column('created_at', server_default=sa.func.now(),
+                              existing_type=sa.DateTime(timezone=True), existing_nullable=False)
@@ -0,0 +1,32 @@
+"""Add cafe ranking_score
+
+Revision ID: f3b9d2c6a481
+Revises: e5a0c7d29b14
+Create Date: 2026-10-18 17:02:47.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d2c6a481'
+down_revision: Union[str, Sequence[str], None] = 'e5a0c7d29b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by the app's ranking recompute (on startup, periodically, or app.app_data.recompute_rankings)
+    op.add_column('cafes', sa.Column('ranking_score', sa.Float(), server_default='0', nullable=False))
+    op.create_index('idx_cafe_ranking_score', 'cafes', ['ranking_score', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cafe_ranking_score', table_name='cafes')
+    # Plain DROP COLUMN (SQLite >= 3.35): a batch rebuild of cafes would drop the cafes_fts triggers
+    op.drop_column('cafes', 'ranking_score')
@@ -0,0 +1,84 @@
+import atexit
+import os
+import shutil
+import tempfile
+import uuid
+
+# The engines are created from these at import time, so they must be set before the app is imported.
+# setdefault: `python -m app.app_data.pg_harness -- python -m pytest` runs the suite on PostgreSQL
+_DATA_DIR = tempfile.mkdtemp(prefix='cafes-tests-')
+# Module level rather than a tmp_path_factory fixture, which would come too late for the engines
+atexit.register(shutil.rmtree, _DATA_DIR, ignore_errors=True)
+os.environ.setdefault('SQLALCHEMY_DATABASE_URL', f'sqlite+aiosqlite:///{_DATA_DIR}/test.db')
+os.environ['ENV'] = 'test'
+os.environ['DB_ECHO'] = 'false'
+os.environ['RANKING_REFRESH_INTERVAL'] = '0'
+os.environ['SIMILAR_REFRESH_INTERVAL'] = '0'
+os.environ['TABLE_VERSION_REFRESH_INTERVAL'] = '0'
+os.environ['SIMILAR_INDEX_PATH'] = os.path.join(_DATA_DIR, 'similar_cafes.npz')
+
+import httpx
+import pytest
+from app.main import app
+from app.app_core.domain.models.category_model import CategoryModel
+from app.app_core.domain.models.user_model import UserModel
+from app.app_core.domain.services.category_registry import category_registry
+from app.app_core.domain.services.city_index import city_index
+from app.infrastructure.auth_backend import current_superuser, current_user
+from app.infrastructure.cache import _caches
+from app.infrastructure.database import AsyncSessionLocal, Base, async_engine, async_read_engine
+from app.infrastructure.etag import refresh_table_versions
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+async def db():
+    """A fresh schema for every test, and a session on it."""
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    for cache in _caches.values():
+        cache.clear()
+    category_registry.invalidate()
+    city_index.invalidate()
+    async with AsyncSessionLocal() as session:
+        # The recreated table_versions starts over at 0
+        await refresh_table_versions(session)
+        yield session
+    # Every test runs on its own event loop; asyncpg connections cannot outlive theirs
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+
+@pytest.fixture
+async def user(db) -> UserModel:
+    user = UserModel(id=uuid.uuid4(), email='admin@example.com', hashed_password='x', username='admin',
+                     is_active=True, is_superuser=True, is_verified=True)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+@pytest.fixture
+async def client(db, user):
+    app.dependency_overrides[current_user] = lambda: user
+    app.dependency_overrides[current_superuser] = lambda: user
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as http_client:
+        yield http_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def categories(db):
+    names = ['solo', 'work', 'dates', 'groups']
+    db.add_all([CategoryModel(name=name) for name in names])
+    await db.commit()
+    return names
+
+
+def cafe_payload(title: str, city: str = 'Kyiv', best_for: str = 'solo', **fields):
+    return {'title': title, 'city': city, 'description': f'{title} description', 'best_for': best_for, **fields}
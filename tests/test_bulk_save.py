@@ -0,0 +1,31 @@
+import pytest
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_reports_a_status_per_item(client, categories):
+    await client.post('/cafes', json=cafe_payload('Existing'))
+    items = [
+        cafe_payload('New'),
+        cafe_payload('Existing', description='Updated'),
+        {'title': 'No description', 'city': 'Kyiv', 'best_for': 'solo'},
+        cafe_payload('Bad category', best_for='nope'),
+        cafe_payload('New'),
+        {'city': 'Kyiv'},
+    ]
+    response = await client.post('/cafes/bulk', json=items)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result['index'] for result in results] == list(range(len(items)))
+    assert [result['status'] for result in results] == ['created', 'updated', 'invalid', 'invalid', 'invalid', 'invalid']
+    assert results[3]['errors'] == ['Unknown categories: nope']
+    assert results[4]['errors'] == ['Duplicate title and city within this request']
+    existing = (await client.get(f"/cafes/{results[1]['id']}")).json()
+    assert existing['description'] == 'Updated'
+
+
+async def test_rejected_item_does_not_shadow_a_later_duplicate(client, categories):
+    items = [cafe_payload('Twice', best_for='nope'), cafe_payload('Twice')]
+    results = (await client.post('/cafes/bulk', json=items)).json()
+    assert [result['status'] for result in results] == ['invalid', 'created']
@@ -0,0 +1,42 @@
+import pytest
+from app.infrastructure.pagination import NEXT_CURSOR_HEADER
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_city_contains_matches_inside_the_name(client, categories):
+    for title, city in (('A', 'Kyiv'), ('B', 'Bila Tserkva'), ('C', 'Lviv')):
+        await client.post('/cafes', json=cafe_payload(title, city=city))
+    prefix = (await client.get('/cafes', params={'city': 'kyi'})).json()
+    assert [cafe['title'] for cafe in prefix] == ['A']
+    contains = (await client.get('/cafes', params={'city': 'erkv', 'city_match': 'contains'})).json()
+    assert [cafe['title'] for cafe in contains] == ['B']
+
+
+async def test_best_for_any_lists_primary_matches_first(client, categories):
+    await client.post('/cafes', json=cafe_payload('Also', best_for='dates', also_good_for=['work']))
+    await client.post('/cafes', json=cafe_payload('Best', best_for='work'))
+    await client.post('/cafes', json=cafe_payload('Other', best_for='groups'))
+
+    primary = (await client.get('/cafes', params={'best_for': 'work'})).json()
+    assert [cafe['title'] for cafe in primary] == ['Best']
+    any_match = (await client.get('/cafes', params={'best_for': 'work', 'best_for_match': 'any'})).json()
+    assert [cafe['title'] for cafe in any_match] == ['Best', 'Also']
+
+
+async def test_best_for_any_pages_keep_primary_first(client, categories):
+    # Ids alternate between also-good and best cafes, so id order alone would interleave them
+    for i in range(40):
+        if i % 2:
+            await client.post('/cafes', json=cafe_payload(f'Best {i}', best_for='work'))
+        else:
+            await client.post('/cafes', json=cafe_payload(f'Also {i}', best_for='solo', also_good_for=['work']))
+    params = {'best_for': 'work', 'best_for_match': 'any'}
+    first = await client.get('/cafes', params=params)
+    second = await client.get('/cafes', params={**params, 'cursor': first.headers[NEXT_CURSOR_HEADER]})
+    titles = [cafe['title'] for cafe in first.json() + second.json()]
+    assert len(titles) == len(set(titles)) == 40
+    assert all(title.startswith('Best') for title in titles[:20])
+    assert all(title.startswith('Also') for title in titles[20:])
+    assert NEXT_CURSOR_HEADER not in second.headers
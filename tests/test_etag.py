@@ -0,0 +1,94 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select, update
+from app.app_core.domain.models.cafe_model import CafeModel, normalize_city
+from app.app_core.domain.models.category_model import CategoryModel
+from app.app_core.domain.models.review_model import ReviewModel
+from app.app_core.domain.models.table_version_model import TableVersionModel
+from app.app_core.repositories import category_repository
+from app.app_core.repositories.cafe_repository import cafe_response_cache
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.etag import refresh_table_versions, table_version
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_unchanged_list_is_not_modified(client, categories):
+    await client.post('/cafes', json=cafe_payload('Etag'))
+    first = await client.get('/cafes', params={'city': 'Kyiv'})
+    assert first.status_code == 200 and first.headers['etag']
+    again = await client.get('/cafes', params={'city': 'Kyiv'}, headers={'If-None-Match': first.headers['etag']})
+    assert again.status_code == 304
+    assert again.headers['etag'] == first.headers['etag']
+    other_query = await client.get('/cafes', params={'city': 'Lviv'}, headers={'If-None-Match': first.headers['etag']})
+    assert other_query.status_code == 200
+
+
+async def test_write_changes_the_tag(client, categories):
+    created = (await client.post('/cafes', json=cafe_payload('Etag'))).json()
+    etag = (await client.get('/cafes')).headers['etag']
+    await client.put(f"/cafes/{created['id']}", json={'description': 'Changed'})
+    response = await client.get('/cafes', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json()[0]['description'] == 'Changed'
+
+
+async def test_failed_write_keeps_the_tag(client, categories, db):
+    etag = (await client.get('/categories')).headers['etag']
+    with pytest.raises(HTTPException) as error:
+        await category_repository.add_category(db, CategoryModel(name='solo'))
+    assert error.value.status_code == 409
+    assert (await client.get('/categories', headers={'If-None-Match': etag})).status_code == 304
+
+
+async def test_write_by_another_process_is_seen_after_refresh(client, categories, db):
+    created = (await client.post('/cafes', json=cafe_payload('Etag'))).json()
+    etag = (await client.get('/cafes')).headers['etag']
+    await client.get(f"/cafes/{created['id']}")
+    assert cafe_response_cache.stats()['size'] == 1
+
+    # What another worker's write leaves behind in the shared database
+    await db.execute(update(TableVersionModel).where(TableVersionModel.name == 'cafes')
+                     .values(version=TableVersionModel.version + 1))
+    await db.commit()
+    assert (await client.get('/cafes', headers={'If-None-Match': etag})).status_code == 304
+
+    assert await refresh_table_versions(db) == {'cafes'}
+    assert (await client.get('/cafes', headers={'If-None-Match': etag})).status_code == 200
+    assert cafe_response_cache.stats()['size'] == 0
+
+
+async def _stored_version(name: str) -> int:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(TableVersionModel.version).where(TableVersionModel.name == name))).scalar_one()
+
+
+async def test_version_row_is_bumped_after_the_write_commits(client, categories, user):
+    cafe_id = (await client.post('/cafes', json=cafe_payload('Etag'))).json()['id']
+    stored, tag = await _stored_version('cafes'), table_version('cafes')
+    async with AsyncSessionLocal() as writer:
+        writer.add(ReviewModel(cafe_id=cafe_id, user_id=user.id, rating=5))
+        await writer.flush()
+        # The open write transaction has not touched (or locked) the shared version row
+        assert await _stored_version('cafes') == stored
+        await writer.commit()
+    assert await _stored_version('cafes') == stored + 1
+    assert table_version('cafes') != tag
+
+
+async def test_registries_reload_after_another_process_writes(client, categories, db):
+    created = (await client.post('/cafes', json=cafe_payload('Etag'))).json()
+    assert [city['name'] for city in (await client.get('/cities/suggest', params={'prefix': 'K'})).json()] == ['Kyiv']
+
+    # Another worker adds a category and moves the cafe; this process's registries were loaded before
+    await db.execute(insert(CategoryModel).values(name='brunch'))
+    await db.execute(update(CafeModel).where(CafeModel.id == created['id'])
+                     .values(city='Kharkiv', city_normalized=normalize_city('Kharkiv')))
+    await db.execute(update(TableVersionModel).where(TableVersionModel.name.in_(['categories', 'cafes']))
+                     .values(version=TableVersionModel.version + 1))
+    await db.commit()
+    await refresh_table_versions(db)
+
+    assert 'brunch' in [category['name'] for category in (await client.get('/categories')).json()]
+    assert [city['name'] for city in (await client.get('/cities/suggest', params={'prefix': 'K'})).json()] == ['Kharkiv']
@@ -0,0 +1,56 @@
+import math
+import numpy as np
+import pytest
+from app.app_core.domain.geo import EARTH_RADIUS_M, covering_cells, encode_geohash, haversine_m
+from tests.conftest import cafe_payload
+
+
+def _offset(latitude: float, longitude: float, distance_m: float, bearing: float) -> tuple[float, float]:
+    """The point ``distance_m`` away from (latitude, longitude) along ``bearing`` (radians)."""
+    angle = distance_m / EARTH_RADIUS_M
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2 = math.asin(math.sin(lat1) * math.cos(angle) + math.cos(lat1) * math.sin(angle) * math.cos(bearing))
+    lon2 = lon1 + math.atan2(math.sin(bearing) * math.sin(angle) * math.cos(lat1),
+                             math.cos(angle) - math.sin(lat1) * math.sin(lat2))
+    return math.degrees(lat2), (math.degrees(lon2) + 180) % 360 - 180
+
+
+def test_encode_geohash_known_value():
+    assert encode_geohash(57.64911, 10.40744) == 'u4pruydqq'
+    assert encode_geohash(57.64911, 10.40744, precision=5) == 'u4pru'
+
+
+@pytest.mark.parametrize('latitude, longitude', [
+    (50.45, 30.52),     # mid-latitude
+    (0.0, 0.0),         # where all four top-level quadrants meet
+    (-33.87, 179.99),   # next to the antimeridian
+    (89.9, 12.0),       # next to the north pole
+])
+@pytest.mark.parametrize('radius_m', [5, 150, 2_000, 50_000])
+def test_covering_cells_contain_every_point_of_the_circle(latitude, longitude, radius_m):
+    cells = covering_cells(latitude, longitude, radius_m)
+    assert len(cells) <= 9
+    rng = np.random.default_rng(7)
+    for distance, bearing in zip(rng.uniform(0, radius_m, 300), rng.uniform(0, 2 * math.pi, 300)):
+        point_hash = encode_geohash(*_offset(latitude, longitude, distance, bearing))
+        assert any(point_hash.startswith(cell) for cell in cells), (distance, bearing)
+
+
+@pytest.mark.anyio
+async def test_nearby_matches_brute_force(client, categories):
+    centre = (50.45, 30.52)
+    rng = np.random.default_rng(11)
+    points = [_offset(*centre, distance, bearing)
+              for distance, bearing in zip(rng.uniform(0, 6_000, 80), rng.uniform(0, 2 * math.pi, 80))]
+    items = [cafe_payload(f'Cafe {i}', latitude=lat, longitude=lon) for i, (lat, lon) in enumerate(points)]
+    ids = [result['id'] for result in (await client.post('/cafes/bulk', json=items)).json()]
+
+    radius = 3_000
+    distances = haversine_m(*centre, np.array([p[0] for p in points]), np.array([p[1] for p in points]))
+    expected = [ids[i] for i in np.argsort(distances) if distances[i] <= radius][:100]
+
+    response = await client.get('/cafes/nearby', params={'lat': centre[0], 'lon': centre[1], 'radius': radius, 'limit': 100})
+    assert response.status_code == 200
+    nearby = response.json()
+    assert [cafe['id'] for cafe in nearby] == expected
+    assert all(a['distance_m'] <= b['distance_m'] for a, b in zip(nearby, nearby[1:]))
@@ -0,0 +1,12 @@
+import pytest
+from app.app_configs import Configs
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_server_timing_is_readable_cross_origin(client, categories):
+    origin = Configs.CORS_ORIGINS[0]
+    response = await client.get('/cafes', headers={'Origin': origin})
+    assert response.headers['server-timing'].startswith('db;dur=')
+    assert response.headers['timing-allow-origin'] == ', '.join(Configs.CORS_ORIGINS)
+    assert 'server-timing' in response.headers['access-control-expose-headers'].lower()
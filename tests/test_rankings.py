@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import update
+from app.app_core.domain.models.cafe_model import CafeModel
+from app.app_core.domain.services import ranking_service
+from app.app_core.repositories import cafe_repository
+from app.app_core.repositories.cafe_repository import cafe_response_cache
+from app.infrastructure.job_lease import RANKING_REFRESH_JOB, claim_job
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def _set_ratings(db, cafe_id: int, rating_sum: int, rating_count: int) -> None:
+    await db.execute(update(CafeModel).where(CafeModel.id == cafe_id)
+                     .values(rating_sum=rating_sum, rating_count=rating_count))
+    await db.commit()
+
+
+@pytest.fixture
+async def ranked_cafes(client, categories, db):
+    """A few-reviews cafe, a many-reviews cafe and an unreviewed one, with scores written."""
+    ids = [(await client.post('/cafes', json=cafe_payload(title))).json()['id'] for title in ('Few', 'Many', 'None')]
+    await _set_ratings(db, ids[0], 40, 10)
+    await _set_ratings(db, ids[1], 20000, 5000)
+    assert await ranking_service.recompute_rankings(db) == 3
+    assert await ranking_service.recompute_rankings(db) == 0
+    return ids
+
+
+async def test_prior_drift_below_tolerance_is_not_written(ranked_cafes, db):
+    few, _many, _unreviewed = ranked_cafes
+    # One 1-star review: the cafe's own score drops, the catalog mean (everyone's prior) barely moves
+    await _set_ratings(db, few, 41, 11)
+    assert await ranking_service.recompute_rankings(db) == 1
+    assert await ranking_service.recompute_rankings(db, tolerance=0) == 2
+
+
+async def test_only_rescored_cafes_leave_the_response_cache(client, ranked_cafes, db):
+    few, many, _unreviewed = ranked_cafes
+    for cafe_id in (few, many):
+        await client.get(f'/cafes/{cafe_id}')
+    await _set_ratings(db, few, 41, 11)
+    await ranking_service.recompute_rankings(db)
+    assert cafe_response_cache.get(few) is None
+    assert cafe_response_cache.get(many) is not None
+
+
+async def test_refresh_lease_is_taken_once_per_interval(db):
+    assert await claim_job(db, RANKING_REFRESH_JOB, 60)
+    assert not await claim_job(db, RANKING_REFRESH_JOB, 60)
+
+
+async def test_rating_arrays_are_filled_chunk_by_chunk(ranked_cafes, db, monkeypatch):
+    monkeypatch.setattr(cafe_repository, 'RATING_FETCH_CHUNK_SIZE', 2)
+    ids, sums, counts, scores = await cafe_repository.get_rating_arrays(db)
+    assert ids.dtype == 'int64' and ids.tolist() == sorted(ranked_cafes)
+    assert sums.tolist() == [40, 20000, 0] and counts.tolist() == [10, 5000, 0]
+    assert len(scores) == 3
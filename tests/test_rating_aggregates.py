@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import select
+from app.app_core.domain.models.cafe_model import CafeModel
+from app.app_core.domain.models.review_model import ReviewModel
+from app.infrastructure.database import AsyncSessionLocal
+from app.infrastructure.etag import table_version
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def _aggregates(cafe_id: int):
+    async with AsyncSessionLocal() as db:
+        cafe = await db.get(CafeModel, cafe_id)
+        return cafe.rating_sum, cafe.rating_count
+
+
+async def _review(review_id: int, session):
+    return (await session.execute(select(ReviewModel).where(ReviewModel.id == review_id))).scalar_one()
+
+
+@pytest.fixture
+async def cafes(client, categories):
+    return [(await client.post('/cafes', json=cafe_payload(title))).json()['id'] for title in ('One', 'Two')]
+
+
+async def test_insert_updates_aggregates_and_average(client, cafes):
+    one, _two = cafes
+    version = table_version('cafes')
+    for rating in (5, 2):
+        assert (await client.post(f'/cafes/{one}/reviews', json={'rating': rating})).status_code == 201
+    assert await _aggregates(one) == (7, 2)
+    assert (await client.get(f'/cafes/{one}')).json()['average_rating'] == 3.5
+    # average_rating is part of every cafe response, so their ETags must move
+    assert table_version('cafes') != version
+
+
+async def test_update_and_move_adjust_both_cafes(client, cafes):
+    one, two = cafes
+    review_id = (await client.post(f'/cafes/{one}/reviews', json={'rating': 4})).json()['id']
+    async with AsyncSessionLocal() as db:
+        (await _review(review_id, db)).rating = 1
+        await db.commit()
+    assert await _aggregates(one) == (1, 1)
+
+    async with AsyncSessionLocal() as db:
+        review = await _review(review_id, db)
+        review.cafe_id, review.rating = two, 3
+        await db.commit()
+    assert await _aggregates(one) == (0, 0)
+    assert await _aggregates(two) == (3, 1)
+
+
+async def test_delete_and_rollback(client, cafes):
+    one, _two = cafes
+    kept = (await client.post(f'/cafes/{one}/reviews', json={'rating': 4})).json()['id']
+    removed = (await client.post(f'/cafes/{one}/reviews', json={'rating': 2})).json()['id']
+    async with AsyncSessionLocal() as db:
+        await db.delete(await _review(removed, db))
+        await db.commit()
+    assert await _aggregates(one) == (4, 1)
+
+    async with AsyncSessionLocal() as db:
+        (await _review(kept, db)).rating = 5
+        await db.flush()
+        await db.rollback()
+    assert await _aggregates(one) == (4, 1)
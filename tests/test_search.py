@@ -0,0 +1,48 @@
+import pytest
+from app.app_core.domain.models.cafe_model import CafeModel
+from app.infrastructure.database import AsyncSessionLocal, async_engine
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def _titles(client, q: str):
+    response = await client.get('/cafes/search', params={'q': q})
+    assert response.status_code == 200
+    return [cafe['title'] for cafe in response.json()]
+
+
+async def test_index_follows_inserts_updates_and_deletes(client, categories):
+    cafe_id = (await client.post('/cafes', json=cafe_payload('Harbour', description='Espresso by the water'))).json()['id']
+    assert await _titles(client, 'espresso') == ['Harbour']
+
+    await client.put(f'/cafes/{cafe_id}', json={'description': 'Matcha by the water'})
+    assert await _titles(client, 'espresso') == []
+    assert await _titles(client, 'matcha') == ['Harbour']
+
+    async with AsyncSessionLocal() as db:
+        await db.delete(await db.get(CafeModel, cafe_id))
+        await db.commit()
+    assert await _titles(client, 'matcha') == []
+
+
+async def test_title_hits_rank_first(client, categories):
+    await client.post('/cafes', json=cafe_payload('Corner', description='The best brulee in town'))
+    await client.post('/cafes', json=cafe_payload('Brulee House', description='Desserts'))
+    assert await _titles(client, 'brulee') == ['Brulee House', 'Corner']
+
+
+@pytest.mark.skipif(async_engine.dialect.name != 'sqlite',
+                    reason="PostgreSQL's 'simple' configuration keeps accents (no unaccent extension)")
+async def test_accents_are_ignored(client, categories):
+    await client.post('/cafes', json=cafe_payload('Corner', description='The best crème brûlée in town'))
+    assert await _titles(client, 'brulee') == ['Corner']
+
+
+async def test_query_syntax_is_treated_as_text(client, categories):
+    await client.post('/cafes', json=cafe_payload('Plain', description='Filter coffee'))
+    for q in ('"coffee', 'coffee*', '(coffee', '-coffee', '^coffee', 'fil'):
+        assert await _titles(client, q) == ['Plain'], q
+    # Operators are plain words that must all occur, not syntax
+    assert await _titles(client, 'coffee OR tea') == []
+    assert await _titles(client, '!!!') == []
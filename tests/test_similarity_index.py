@@ -0,0 +1,76 @@
+import os
+import pytest
+from app.app_configs import Configs
+from app.app_core.domain.services import ranking_service
+from app.app_core.domain.services.similarity_index import SimilarityIndex
+from app.infrastructure.etag import CAFE_CONTENT_VERSION, table_version
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_reviews_and_rankings_leave_content_version(client, categories, db):
+    cafe_id = (await client.post('/cafes', json=cafe_payload('Quiet', also_good_for=['work']))).json()['id']
+    content, catalog = table_version(CAFE_CONTENT_VERSION), table_version('cafes')
+
+    assert (await client.post(f'/cafes/{cafe_id}/reviews', json={'rating': 5})).status_code == 201
+    await ranking_service.recompute_rankings(db)
+    assert table_version('cafes') != catalog
+    assert table_version(CAFE_CONTENT_VERSION) == content
+
+    await client.put(f'/cafes/{cafe_id}', json={'image_url': 'https://example.com/quiet.png'})
+    assert table_version(CAFE_CONTENT_VERSION) == content
+    await client.put(f'/cafes/{cafe_id}', json={'description': 'Quiet place with a garden'})
+    assert table_version(CAFE_CONTENT_VERSION) != content
+
+
+async def test_saved_index_remembers_its_content_version(client, categories, db):
+    for title in ('Quiet', 'Loud', 'Garden'):
+        await client.post('/cafes', json=cafe_payload(title))
+    index = SimilarityIndex(k=2)
+    await index.rebuild(db)
+    index.save(Configs.SIMILAR_INDEX_PATH)
+
+    loaded = SimilarityIndex(k=2)
+    assert loaded.load(Configs.SIMILAR_INDEX_PATH)
+    assert loaded.built_version == table_version(CAFE_CONTENT_VERSION)
+    assert loaded.ids.tolist() == index.ids.tolist()
+
+
+async def test_empty_and_stop_word_catalogs_build(client, categories, db):
+    index = SimilarityIndex(k=2)
+    await index.rebuild(db)
+    assert index.ids.tolist() == [] and index.lookup(1) is None
+
+    # Nothing but stop words: no text features, the categories alone decide
+    ids = [(await client.post('/cafes', json=cafe_payload(title, description='the and of', best_for=best_for))).json()['id']
+           for title, best_for in (('The', 'solo'), ('And', 'solo'), ('Of', 'work'))]
+    await index.rebuild(db)
+    assert index.lookup(ids[0], limit=1) == [(ids[1], pytest.approx(1.0))]
+
+
+async def test_only_the_lease_holder_rebuilds(client, categories, db, tmp_path):
+    for title in ('Quiet', 'Loud', 'Garden'):
+        await client.post('/cafes', json=cafe_payload(title))
+    path = str(tmp_path / 'similar.npz')
+    leader, follower = SimilarityIndex(k=2), SimilarityIndex(k=2)
+    await leader.refresh(path, lease=60)
+    assert leader.built_version == table_version(CAFE_CONTENT_VERSION)
+    # The follower picks up the leader's file instead of building its own
+    await follower.refresh(path, lease=60)
+    assert follower.built_version == leader.built_version
+    assert follower.ids.tolist() == leader.ids.tolist()
+
+    await client.post('/cafes', json=cafe_payload('Late'))
+    # Still leased by the leader: nobody else rebuilds, the follower keeps serving its index
+    await follower.refresh(path, lease=60)
+    assert follower.built_version == leader.built_version
+
+
+async def test_save_leaves_no_temporary_files(client, categories, db, tmp_path):
+    await client.post('/cafes', json=cafe_payload('Quiet'))
+    index = SimilarityIndex(k=2)
+    await index.rebuild(db)
+    index.save(str(tmp_path / 'similar.npz'))
+    index.save(str(tmp_path / 'similar.npz'))
+    assert os.listdir(tmp_path) == ['similar.npz']
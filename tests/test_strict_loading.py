@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+from app.app_configs import Configs
+from app.app_core.domain.models.cafe_category_model import CafeCategoryModel
+from app.app_core.domain.models.cafe_model import CafeModel
+from app.app_core.domain.models.review_model import ReviewModel
+from app.app_core.repositories import review_repository
+from app.infrastructure.database import AsyncSessionLocal
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_strict_loading_is_on_for_test_runs():
+    assert Configs.ORM_STRICT_LOADING
+
+
+async def test_unloaded_relationship_raises(client, categories):
+    await client.post('/cafes', json=cafe_payload('Strict', also_good_for=['work']))
+    async with AsyncSessionLocal() as db:
+        cafe = (await db.execute(select(CafeModel))).scalar_one()
+        with pytest.raises(InvalidRequestError, match='category_associations'):
+            cafe.best_for
+        with pytest.raises(InvalidRequestError, match='reviews'):
+            cafe.reviews
+
+
+async def test_named_loaders_satisfy_strict_mode(client, categories):
+    await client.post('/cafes', json=cafe_payload('Strict', also_good_for=['work']))
+    async with AsyncSessionLocal() as db:
+        cafe = (await db.execute(
+            select(CafeModel).options(
+                selectinload(CafeModel.category_associations).selectinload(CafeCategoryModel.category))
+        )).scalar_one()
+        assert cafe.best_for.name == 'solo'
+        assert [category.name for category in cafe.also_good_for] == ['work']
+
+
+async def test_added_review_does_not_lazy_load_its_cafe(client, categories, user):
+    cafe_id = (await client.post('/cafes', json=cafe_payload('Strict'))).json()['id']
+    async with AsyncSessionLocal() as db:
+        review = await review_repository.add_review(db, ReviewModel(cafe_id=cafe_id, user_id=user.id, rating=4))
+        with pytest.raises(InvalidRequestError, match='cafe'):
+            review.cafe
@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from sqlalchemy import func, select
+from app.app_core.domain.models.cafe_model import CafeModel
+from app.app_core.domain.schemas.cafe_schemas import CafeCreateSchema
+from app.app_core.domain.services import cafe_service
+from app.infrastructure.database import AsyncSessionLocal
+from tests.conftest import cafe_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_returns_the_existing_cafe_unchanged(client, categories):
+    first = (await client.post('/cafes', json=cafe_payload('Twin', also_good_for=['work']))).json()
+    again = (await client.post('/cafes', json=cafe_payload('Twin', description='Other', best_for='dates'))).json()
+    assert again['id'] == first['id']
+    assert (again['description'], again['best_for'], again['also_good_for']) == ('Twin description', 'solo', ['work'])
+
+
+async def test_update_existing_replaces_content_and_categories(client, categories, db):
+    first = (await client.post('/cafes', json=cafe_payload('Twin', also_good_for=['work']))).json()
+    updated = await cafe_service.create_cafe(db, CafeCreateSchema(**cafe_payload(
+        'Twin', description='Renovated', best_for='dates', also_good_for=['groups'])), update_existing=True)
+    assert updated.id == first['id']
+    assert (updated.description, updated.best_for, updated.also_good_for) == ('Renovated', 'dates', ['groups'])
+
+
+async def test_concurrent_creates_of_one_cafe_make_one_row(client, categories):
+    async def create():
+        async with AsyncSessionLocal() as session:
+            return (await cafe_service.create_cafe(session, CafeCreateSchema(**cafe_payload('Race')))).id
+
+    ids = await asyncio.gather(*(create() for _ in range(8)))
+    assert len(set(ids)) == 1
+    async with AsyncSessionLocal() as session:
+        assert await session.scalar(select(func.count()).select_from(CafeModel)) == 1
+
+
+async def test_update_onto_an_existing_title_and_city_is_a_409(client, categories):
+    await client.post('/cafes', json=cafe_payload('Twin', city='Kyiv'))
+    other = (await client.post('/cafes', json=cafe_payload('Twin', city='Lviv'))).json()
+    response = await client.put(f"/cafes/{other['id']}", json={'city': 'Kyiv'})
+    assert response.status_code == 409
+    assert (await client.get(f"/cafes/{other['id']}")).json()['city'] == 'Lviv'